@@ -6,7 +6,11 @@ from app.charts.charts import (
     create_price_chart,
     create_portfolio_performance_chart,
     filter_dataframe_by_time_range,
+    lttb_downsample,
+    downsample_price_history,
+    PRICE_CHART_MAX_POINTS,
     TIME_RANGES,
+    TICKER_CURRENCY_MAP,
 )
 
 __all__ = [
@@ -15,5 +19,9 @@ __all__ = [
     "create_price_chart",
     "create_portfolio_performance_chart",
     "filter_dataframe_by_time_range",
+    "lttb_downsample",
+    "downsample_price_history",
+    "PRICE_CHART_MAX_POINTS",
     "TIME_RANGES",
+    "TICKER_CURRENCY_MAP",
 ]
@@ -2,6 +2,7 @@
 
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
@@ -21,35 +22,89 @@ TICKER_CURRENCY_MAP = {
     "VWRP.L": "£",
 }
 
+# Price lines longer than this are downsampled before plotting
+PRICE_CHART_MAX_POINTS = 2000
+
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Pick the indices of n_out points that preserve the shape of a line (LTTB).
+
+    Largest-Triangle-Three-Buckets keeps the first and last points and, from each bucket of
+    the points in between, the one forming the largest triangle with the previously kept
+    point and the average of the next bucket. Returns all indices if there are no more than
+    n_out points.
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    selected = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (end, edges[i + 2]) if i < n_out - 3 else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(areas.argmax())
+        indices[i + 1] = selected
+
+    return indices
+
+
+def downsample_price_history(
+    df: pd.DataFrame, max_points: int = PRICE_CHART_MAX_POINTS
+) -> pd.DataFrame:
+    """Reduce a Date/Price frame to at most max_points rows with LTTB for plotting.
+
+    Frames that are already short enough are returned as-is.
+    """
+    if len(df) <= max_points:
+        return df
+    dates = df["Date"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    return df.iloc[lttb_downsample(dates, df["Price"].to_numpy(), max_points)]
+
 
 def create_timeline_chart(df: pd.DataFrame, fund_name: str) -> go.Figure:
-    """Create a bar chart of buy/sell transactions with positive/negative bars."""
+    """Create a bar chart of buy/sell transactions with positive/negative bars.
+
+    Expects Date already parsed to datetime64 and rows sorted by date ascending, as
+    returned by get_fund_transactions.
+    """
     if df.empty:
         return None
 
-    # Convert date to datetime
-    df_chart = df.copy()
-    df_chart["Date"] = pd.to_datetime(df_chart["Date"])
-    df_chart = df_chart.sort_values("Date")
+    dates = df["Date"].to_numpy()
+    types = df["Type"].to_numpy()
 
     # Create bar values (positive for buys, negative for sells)
-    df_chart["Bar Value"] = df_chart.apply(
-        lambda row: row["Units"] if row["Type"] == "BUY" else -row["Units"], axis=1
-    )
+    units = df["Units"].to_numpy(dtype=np.float64)
+    bar_values = np.where(types == "BUY", units, -units)
 
     # Determine colors (green for buys, red for sells)
-    colors = ["green" if val > 0 else "red" for val in df_chart["Bar Value"]]
+    colors = np.where(bar_values > 0, "green", "red").tolist()
 
     fig = go.Figure()
 
     fig.add_trace(
         go.Bar(
-            x=df_chart["Date"],
-            y=df_chart["Bar Value"],
+            x=dates,
+            y=bar_values,
             marker=dict(color=colors),
             name="Transactions",
             hovertemplate="<b>%{customdata}</b><br>Date: %{x|%Y-%m-%d}<br>Units: %{y:.2f}<extra></extra>",
-            customdata=df_chart["Type"],
+            customdata=types,
         )
     )
 
@@ -71,24 +126,20 @@ def create_timeline_chart(df: pd.DataFrame, fund_name: str) -> go.Figure:
 
 
 def create_cumulative_units_chart(df: pd.DataFrame, fund_name: str) -> go.Figure:
-    """Create a chart showing cumulative units over time."""
+    """Create a chart showing cumulative units over time.
+
+    Expects the running totals from get_cumulative_units (Date, Cumulative Units), which
+    are already sorted by date.
+    """
     if df.empty:
         return None
 
-    # Convert date to datetime
-    df = df.copy()
-    df["Date"] = pd.to_datetime(df["Date"])
-    df = df.sort_values("Date")
-
-    # Calculate cumulative units (buys are positive, sells are negative)
-    df["Cumulative Units"] = df["Units"].where(df["Type"] == "BUY", -df["Units"]).cumsum()
-
     fig = go.Figure()
 
     fig.add_trace(
-        go.Scatter(
-            x=df["Date"],
-            y=df["Cumulative Units"],
+        go.Scattergl(
+            x=df["Date"].to_numpy(),
+            y=df["Cumulative Units"].to_numpy(dtype=np.float64),
             fill="tozeroy",
             name="Cumulative Units",
             line=dict(color="blue", width=2),
@@ -118,13 +169,16 @@ def create_price_chart(
     # Determine currency symbol based on ticker
     currency_symbol = TICKER_CURRENCY_MAP.get(ticker, "£")
 
+    # Downsample long histories; the chart is only a couple of thousand pixels wide
+    line_df = downsample_price_history(df)
+
     fig = go.Figure()
 
     # Price line
     fig.add_trace(
-        go.Scatter(
-            x=df["Date"],
-            y=df["Price"],
+        go.Scattergl(
+            x=line_df["Date"],
+            y=line_df["Price"],
             fill="tozeroy",
             name="Price",
             line=dict(color="green", width=2),
@@ -138,9 +192,9 @@ def create_price_chart(
         buy_df = transactions_df[transactions_df["Type"] == "BUY"]
         if not buy_df.empty:
             fig.add_trace(
-                go.Scatter(
-                    x=buy_df["Date"],
-                    y=buy_df["Marker_Y"],
+                go.Scattergl(
+                    x=buy_df["Date"].to_numpy(),
+                    y=buy_df["Marker_Y"].to_numpy(dtype=np.float64),
                     mode="markers",
                     name="BUY",
                     marker=dict(
@@ -157,7 +211,7 @@ def create_price_chart(
                         "Value: £%{customdata[2]:,.2f}"
                         "<extra></extra>"
                     ),
-                    customdata=buy_df[["Units", "Price", "Value"]].values,
+                    customdata=buy_df[["Units", "Price", "Value"]].to_numpy(dtype=np.float64),
                 )
             )
 
@@ -165,9 +219,9 @@ def create_price_chart(
         sell_df = transactions_df[transactions_df["Type"] == "SELL"]
         if not sell_df.empty:
             fig.add_trace(
-                go.Scatter(
-                    x=sell_df["Date"],
-                    y=sell_df["Marker_Y"],
+                go.Scattergl(
+                    x=sell_df["Date"].to_numpy(),
+                    y=sell_df["Marker_Y"].to_numpy(dtype=np.float64),
                     mode="markers",
                     name="SELL",
                     marker=dict(
@@ -181,7 +235,7 @@ def create_price_chart(
                         "Value: £%{customdata[2]:,.2f}"
                         "<extra></extra>"
                     ),
-                    customdata=sell_df[["Units", "Price", "Value"]].values,
+                    customdata=sell_df[["Units", "Price", "Value"]].to_numpy(dtype=np.float64),
                 )
             )
 
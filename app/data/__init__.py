@@ -2,8 +2,11 @@
 
 from app.data import sql
 from app.data.queries import (
+    CACHE_TTL_SECONDS,
     get_all_funds_from_db,
     get_fund_transactions,
+    get_fund_summary,
+    get_cumulative_units,
     get_all_transactions,
     get_recent_transactions,
     get_fund_holdings,
@@ -11,18 +14,24 @@ from app.data.queries import (
     get_all_price_tickers,
     get_ticker_info_dict,
     get_price_history,
+    get_price_history_bulk,
     get_transactions_for_ticker,
     get_fund_mapping_status,
+    get_fund_mapping_summary,
     get_gbp_usd_rate,
     get_current_holdings_vip,
+    get_vip_fund_count,
     get_portfolio_value_timeseries,
     get_aggregated_holdings,
 )
 
 __all__ = [
     "sql",
+    "CACHE_TTL_SECONDS",
     "get_all_funds_from_db",
     "get_fund_transactions",
+    "get_fund_summary",
+    "get_cumulative_units",
     "get_all_transactions",
     "get_recent_transactions",
     "get_fund_holdings",
@@ -30,10 +39,13 @@ __all__ = [
     "get_all_price_tickers",
     "get_ticker_info_dict",
     "get_price_history",
+    "get_price_history_bulk",
     "get_transactions_for_ticker",
     "get_fund_mapping_status",
+    "get_fund_mapping_summary",
     "get_gbp_usd_rate",
     "get_current_holdings_vip",
+    "get_vip_fund_count",
     "get_portfolio_value_timeseries",
     "get_aggregated_holdings",
 ]
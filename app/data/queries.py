@@ -2,214 +2,280 @@
 
 import json
 import logging
+import sqlite3
 
 import pandas as pd
+import streamlit as st
 
 from portfolio.core.database import TransactionDatabase
 from app.data import sql
 
 logger = logging.getLogger(__name__)
 
+# How long cached query results are reused before the database is read again
+CACHE_TTL_SECONDS = 3600
+
+# Display names for transaction columns, in the order GET_ALL_TRANSACTIONS and
+# GET_FUND_TRANSACTIONS select them
+TRANSACTION_DISPLAY_NAMES = {
+    "date": "Date",
+    "platform": "Platform",
+    "tax_wrapper": "Tax Wrapper",
+    "fund_name": "Fund Name",
+    "transaction_type": "Type",
+    "units": "Units",
+    "price_per_unit": "Price (£)",
+    "value": "Value (£)",
+    "currency": "Currency",
+}
+
+# Low-cardinality transaction columns, stored as categories so comparisons use integer codes
+TRANSACTION_CATEGORY_DTYPES = dict.fromkeys(
+    ["platform", "tax_wrapper", "transaction_type", "currency"], "category"
+)
+
+# Repeated labels in the VIP holdings frame, grouped and filtered on by the holdings tab
+HOLDINGS_CATEGORY_DTYPES = dict.fromkeys(["fund_name", "tax_wrapper", "platform"], "category")
+
+# Rows are read as tuples, so these must follow the SELECT order in sql.py
+RECENT_TRANSACTION_COLUMNS = [
+    "date",
+    "platform",
+    "tax_wrapper",
+    "fund_name",
+    "transaction_type",
+    "units",
+    "value",
+]
+
+
+@st.cache_resource
+def get_db() -> TransactionDatabase:
+    """Get the shared database connection, opened once and reused across reruns.
+
+    The connection is shared by Streamlit's script threads, so the same-thread check
+    is disabled.
+    """
+    return TransactionDatabase("portfolio.db", check_same_thread=False)
 
-def get_all_funds_from_db():
-    """Get all unique funds from the database with their mapped names (excluding excluded funds)."""
-    db = TransactionDatabase("portfolio.db")
-    cursor = db.conn.cursor()
+
+def get_tuple_cursor() -> sqlite3.Cursor:
+    """Get a cursor on the shared connection that returns plain tuples.
+
+    The bulk loaders build DataFrames positionally, so they skip the sqlite3.Row object
+    the connection's row factory would allocate for every row.
+    """
+    cursor = get_db().conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_all_funds_from_db() -> pd.DataFrame:
+    """Get all unique funds from the database (excluding excluded funds).
+
+    Returns DataFrame sorted by display name with columns:
+    - fund_name: Original fund name
+    - display_name: Mapped fund name, falling back to the original name
+    - tx_count: Number of transactions for the fund
+    """
+    cursor = get_tuple_cursor()
     cursor.execute(sql.GET_ALL_FUNDS)
-    funds = {}
-    for row in cursor.fetchall():
-        funds[row["fund_name"]] = row["display_name"]
-    db.close()
-    return funds
+    rows = cursor.fetchall()
+    return pd.DataFrame.from_records(rows, columns=["fund_name", "display_name", "tx_count"])
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_fund_transactions(fund_name: str) -> pd.DataFrame:
-    """Get transactions for a specific fund."""
-    db = TransactionDatabase("portfolio.db")
-    cursor = db.conn.cursor()
+    """Get transactions for a specific fund, with Date parsed and categorical labels."""
+    cursor = get_tuple_cursor()
     cursor.execute(sql.GET_FUND_TRANSACTIONS, (fund_name,))
 
     rows = cursor.fetchall()
-    db.close()
 
     if not rows:
         return pd.DataFrame()
 
-    data = []
-    for row in rows:
-        # Use mapped name if available, otherwise original name
-        display_name = row["mapped_fund_name"] if row["mapped_fund_name"] else row["fund_name"]
-
-        data.append(
-            {
-                "Date": row["date"],
-                "Platform": row["platform"],
-                "Tax Wrapper": row["tax_wrapper"],
-                "Fund Name": display_name,
-                "Type": row["transaction_type"],
-                "Units": row["units"],
-                "Price (£)": row["price_per_unit"],
-                "Value (£)": row["value"],
-                "Currency": row["currency"],
-            }
-        )
-
-    return pd.DataFrame(data)
+    # fund_name is already the mapped name where one is set (resolved in SQL)
+    df = pd.DataFrame.from_records(rows, columns=list(TRANSACTION_DISPLAY_NAMES))
+    df["date"] = pd.to_datetime(df["date"], format="ISO8601")
+    df = df.astype(TRANSACTION_CATEGORY_DTYPES)
+    return df.rename(columns=TRANSACTION_DISPLAY_NAMES)
 
 
 def get_all_transactions() -> pd.DataFrame:
-    """Get all transactions from the database."""
-    db = TransactionDatabase("portfolio.db")
-    cursor = db.conn.cursor()
+    """Get all transactions from the database, with Date parsed and categorical labels."""
+    cursor = get_tuple_cursor()
     cursor.execute(sql.GET_ALL_TRANSACTIONS)
 
     rows = cursor.fetchall()
-    db.close()
 
     if not rows:
         return pd.DataFrame()
 
-    data = []
-    for row in rows:
-        data.append(
-            {
-                "Date": row["date"],
-                "Platform": row["platform"],
-                "Tax Wrapper": row["tax_wrapper"],
-                "Fund Name": row["fund_name"],
-                "Type": row["transaction_type"],
-                "Units": row["units"],
-                "Price (£)": row["price_per_unit"],
-                "Value (£)": row["value"],
-                "Currency": row["currency"],
-            }
-        )
-
-    return pd.DataFrame(data)
+    df = pd.DataFrame.from_records(rows, columns=list(TRANSACTION_DISPLAY_NAMES))
+    df["date"] = pd.to_datetime(df["date"], format="ISO8601")
+    df = df.astype(TRANSACTION_CATEGORY_DTYPES)
+    return df.rename(columns=TRANSACTION_DISPLAY_NAMES)
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_recent_transactions(limit: int = 10) -> pd.DataFrame:
-    """Get the N most recent transactions with mapped fund names."""
-    db = TransactionDatabase("portfolio.db")
-    cursor = db.conn.cursor()
+    """Get the N most recent transactions with mapped fund names and parsed dates."""
+    cursor = get_tuple_cursor()
     cursor.execute(sql.GET_RECENT_TRANSACTIONS, (limit,))
 
     rows = cursor.fetchall()
-    db.close()
 
     if not rows:
         return pd.DataFrame()
 
-    data = []
-    for row in rows:
-        data.append(
-            {
-                "Date": row["date"],
-                "Fund Name": row["fund_name"],
-                "Type": row["transaction_type"],
-                "Units": row["units"],
-                "Value (£)": row["value"],
-                "Platform": row["platform"],
-                "Tax Wrapper": row["tax_wrapper"],
-            }
-        )
+    df = pd.DataFrame.from_records(rows, columns=RECENT_TRANSACTION_COLUMNS)
+    df["date"] = pd.to_datetime(df["date"], format="ISO8601")
+    return df.rename(columns=TRANSACTION_DISPLAY_NAMES)[
+        ["Date", "Fund Name", "Type", "Units", "Value (£)", "Platform", "Tax Wrapper"]
+    ]
 
-    return pd.DataFrame(data)
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_cumulative_units(fund_name: str) -> pd.DataFrame:
+    """Get units held by a fund at the end of each transaction date.
+
+    The running total is computed in SQL, one row per date, with columns Date (datetime64)
+    and Cumulative Units.
+    """
+    cursor = get_tuple_cursor()
+    cursor.execute(sql.GET_CUMULATIVE_UNITS, (fund_name,))
 
+    df = pd.DataFrame.from_records(cursor.fetchall(), columns=["Date", "Cumulative Units"])
+    df["Date"] = pd.to_datetime(df["Date"], format="ISO8601")
+    return df
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_fund_summary(fund_name: str) -> dict:
+    """Get summary counts and totals for a fund's transactions, aggregated in SQL.
+
+    Returns dict with keys:
+    - transaction_count: Number of transactions
+    - buy_count / sell_count: Number of BUY / SELL transactions
+    - total_buys / total_sells: Total value of BUY / SELL transactions
+    """
+    db = get_db()
+    cursor = db.conn.cursor()
+    cursor.execute(sql.GET_FUND_SUMMARY, (fund_name,))
+    return dict(cursor.fetchone())
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_fund_holdings() -> pd.DataFrame:
     """Get current holdings for each fund (units held, excluding zero holdings)."""
-    db = TransactionDatabase("portfolio.db")
-    cursor = db.conn.cursor()
+    cursor = get_tuple_cursor()
     cursor.execute(sql.GET_FUND_HOLDINGS)
 
     rows = cursor.fetchall()
-    db.close()
 
     if not rows:
         return pd.DataFrame()
 
-    data = []
-    for row in rows:
-        data.append(
-            {
-                "Fund Name": row["fund_name"],
-                "Units Held": row["units_held"],
-                "Transactions": row["transaction_count"],
-            }
-        )
-
-    return pd.DataFrame(data)
+    df = pd.DataFrame.from_records(rows, columns=["fund_name", "units_held", "transaction_count"])
+    return df.rename(
+        columns={
+            "fund_name": "Fund Name",
+            "units_held": "Units Held",
+            "transaction_count": "Transactions",
+        }
+    )
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_standardized_name(original_name: str) -> str:
     """Get the standardized/mapped name for a fund from transactions table."""
-    db = TransactionDatabase("portfolio.db")
+    db = get_db()
     cursor = db.conn.cursor()
     cursor.execute(sql.GET_STANDARDIZED_NAME, (original_name,))
     result = cursor.fetchone()
-    db.close()
     if result:
         return result["display_name"]
     return original_name
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_all_price_tickers():
     """Get all available price tickers from the database."""
-    db = TransactionDatabase("portfolio.db")
+    db = get_db()
     tickers = db.get_all_price_tickers()
-    db.close()
     return tickers
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_ticker_info_dict():
     """Get information about all tickers as a dictionary (ticker -> fund_name)."""
-    db = TransactionDatabase("portfolio.db")
-    ticker_info = db.get_ticker_info()
-    db.close()
-    return {info["ticker"]: info["fund_name"] for info in ticker_info}
+    cursor = get_tuple_cursor()
+    cursor.execute(sql.GET_TICKER_FUND_NAMES)
+    return dict(cursor)
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_price_history(ticker: str) -> pd.DataFrame:
-    """Get price history for a specific ticker."""
-    db = TransactionDatabase("portfolio.db")
-    prices = db.get_price_history_by_ticker(ticker)
-    db.close()
+    """Get price history for a specific ticker, sorted by date.
+
+    Dates are parsed to datetime64 while the rows are read, and results are cached per
+    ticker so re-selecting a ticker does not hit the database again.
+    """
+    db = get_db()
+    df = pd.read_sql_query(sql.GET_PRICE_HISTORY, db.conn, params=(ticker,), parse_dates=["Date"])
+    return df
 
-    if not prices:
-        return pd.DataFrame()
 
-    df = pd.DataFrame(prices)
-    df["Date"] = pd.to_datetime(df["date"])
-    df = df.rename(columns={"close_price": "Price"})
-    return df[["Date", "Price", "ticker", "fund_name"]].sort_values("Date")
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_price_history_bulk(tickers: tuple[str, ...]) -> dict[str, pd.DataFrame]:
+    """Get price history for several tickers in one query, keyed by ticker.
+
+    Each frame matches get_price_history (sorted by date, Date parsed). Tickers without
+    price history are left out of the result.
+    """
+    if not tickers:
+        return {}
+
+    db = get_db()
+    query = sql.GET_PRICE_HISTORY_FOR_TICKERS.format(placeholders=",".join("?" * len(tickers)))
+    df = pd.read_sql_query(query, db.conn, params=tickers, parse_dates=["Date"])
+    return {
+        ticker: ticker_df.reset_index(drop=True)
+        for ticker, ticker_df in df.groupby("ticker", sort=False)
+    }
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_transactions_for_ticker(ticker: str) -> pd.DataFrame:
     """Get buy/sell transactions for a specific ticker using fund_ticker_mapping."""
-    db = TransactionDatabase("portfolio.db")
+    db = get_db()
     transactions = db.get_transactions_for_ticker(ticker)
-    db.close()
 
     if not transactions:
         return pd.DataFrame()
 
-    data = []
-    for row in transactions:
-        data.append(
-            {
-                "Date": pd.to_datetime(row["date"]),
-                "Type": row["transaction_type"],
-                "Units": row["units"],
-                "Price": row["price_per_unit"],
-                "Value": row["value"],
-                "Marker_Y": row["marker_y"],  # Y-position on chart (close price from that date)
-            }
-        )
-
-    return pd.DataFrame(data)
+    df = pd.DataFrame.from_records(
+        transactions,
+        columns=["date", "transaction_type", "units", "price_per_unit", "value", "marker_y"],
+    ).rename(
+        columns={
+            "date": "Date",
+            "transaction_type": "Type",
+            "units": "Units",
+            "price_per_unit": "Price",
+            "value": "Value",
+            "marker_y": "Marker_Y",  # Y-position on chart (close price from that date)
+        }
+    )
+    df["Date"] = pd.to_datetime(df["Date"], format="ISO8601")
+    # BUY/SELL is compared on every render, so store it as integer category codes
+    df["Type"] = df["Type"].astype("category")
+    return df
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_fund_mapping_status() -> pd.DataFrame:
     """Get mapping status for all funds with transactions.
 
@@ -221,52 +287,44 @@ def get_fund_mapping_status() -> pd.DataFrame:
     - has_price_history: Boolean indicating if price history exists
     - vip: Boolean indicating if ticker is marked as VIP
     """
-    db = TransactionDatabase("portfolio.db")
+    db = get_db()
     cursor = db.conn.cursor()
-
     cursor.execute(sql.GET_FUND_MAPPING_STATUS)
 
-    data = []
-    for row in cursor.fetchall():
-        fund_name = row["fund_name"]
-        transaction_count = row["transaction_count"]
-        mapped_fund_name = row["mapped_fund_name"] if row["mapped_fund_name"] else None
-
-        # Get mapping for this fund
-        mapping = db.get_ticker_for_fund(fund_name)
-        ticker = mapping if mapping else None
-
-        # Check if we have price history for this ticker
-        has_price_history = False
-        vip = False
-        if ticker:
-            cursor.execute(sql.GET_PRICE_HISTORY_COUNT, (ticker,))
-            result = cursor.fetchone()
-            has_price_history = result["count"] > 0 if result else False
-
-            # Check VIP status
-            cursor.execute(sql.GET_VIP_STATUS, (ticker,))
-            vip_result = cursor.fetchone()
-            vip = bool(vip_result["vip"]) if vip_result and vip_result["vip"] else False
-
-        data.append(
-            {
-                "fund_name": fund_name,
-                "mapped_fund_name": mapped_fund_name if mapped_fund_name else "—",
-                "transaction_count": transaction_count,
-                "ticker": ticker if ticker else "—",
-                "has_price_history": has_price_history,
-                "vip": vip,
-            }
-        )
-
-    db.close()
-    # Sort by VIP (descending) then by transaction count (descending)
-    df = pd.DataFrame(data)
-    df = df.sort_values(by=["vip", "transaction_count"], ascending=[False, False])
+    # Rows arrive already sorted by VIP then transaction count (both descending)
+    df = pd.DataFrame(
+        [dict(row) for row in cursor.fetchall()],
+        columns=[
+            "fund_name",
+            "mapped_fund_name",
+            "transaction_count",
+            "ticker",
+            "has_price_history",
+            "vip",
+        ],
+    )
+    df["mapped_fund_name"] = df["mapped_fund_name"].fillna("").replace("", "—")
+    df["ticker"] = df["ticker"].fillna("—").astype("category")
+    df["has_price_history"] = df["has_price_history"].astype(bool)
+    df["vip"] = df["vip"].fillna(0).astype(bool)
     return df
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_fund_mapping_summary() -> dict:
+    """Get fund mapping counts for the Mapping Status metrics, aggregated in SQL.
+
+    Returns dict with keys:
+    - total_funds: Number of funds with transactions
+    - mapped_count: Number of those funds mapped to a ticker
+    - with_price_history: Number of those funds whose ticker has price history
+    """
+    db = get_db()
+    cursor = db.conn.cursor()
+    cursor.execute(sql.GET_FUND_MAPPING_SUMMARY)
+    return dict(cursor.fetchone())
+
+
 def get_gbp_usd_rate():
     """Get current GBP/USD exchange rate using yfinance."""
     import yfinance as yf
@@ -309,6 +367,7 @@ def get_gbp_eur_rate():
         return 0.83  # Fallback rate
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_portfolio_value_timeseries(
     include_benchmark: bool = True, benchmark_ticker: str = "VWRL.L"
 ) -> pd.DataFrame:
@@ -326,7 +385,7 @@ def get_portfolio_value_timeseries(
     Uses forward-fill for missing prices to handle gaps in price data.
     Converts LSE pence prices to pounds.
     """
-    db = TransactionDatabase("portfolio.db")
+    db = get_db()
     cursor = db.conn.cursor()
 
     # Get all transactions with tickers
@@ -337,8 +396,6 @@ def get_portfolio_value_timeseries(
     cursor.execute(sql.GET_ALL_PRICE_HISTORY)
     prices = cursor.fetchall()
 
-    db.close()
-
     if not transactions or not prices:
         return pd.DataFrame()
 
@@ -401,8 +458,8 @@ def get_portfolio_value_timeseries(
     ]
     price_pivot = price_pivot[valid_tickers]
 
-    # Get unique dates from price history
-    all_dates = sorted(price_pivot.index.unique())
+    # Unique dates from price history (pivot_table already returns a sorted, unique index)
+    all_dates = price_pivot.index
 
     # Calculate cumulative units held per ticker as of each date
     # Only include tickers that have sufficient price history
@@ -412,7 +469,8 @@ def get_portfolio_value_timeseries(
     cumulative_units = {}
     first_tx_dates = {}  # Track when each ticker was first purchased
     for ticker in tickers:
-        ticker_tx = tx_df[tx_df["ticker"] == ticker].sort_values("date")
+        # Rows arrive ordered by date from SQL, and filtering keeps that order
+        ticker_tx = tx_df[tx_df["ticker"] == ticker]
         # Calculate signed units (positive for BUY, negative for SELL)
         ticker_tx = ticker_tx.copy()
         ticker_tx["signed_units"] = ticker_tx.apply(
@@ -483,11 +541,12 @@ def get_portfolio_value_timeseries(
     return result_df
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_current_holdings_vip():
     """Get current holdings from JSON file for VIP funds only, using mapped fund names.
-    Converts USD and EUR prices to GBP for consistency.
+    Converts USD and EUR prices to GBP for consistency. Rows are sorted by value, largest first.
     """
-    db = TransactionDatabase("portfolio.db")
+    db = get_db()
     cursor = db.conn.cursor()
 
     # Load holdings from JSON file (new format: grouped by ticker)
@@ -567,10 +626,27 @@ def get_current_holdings_vip():
                 }
             )
 
-    db.close()
-    return pd.DataFrame(data)
+    if not data:
+        return pd.DataFrame()
+    # Sorted once here by value (descending) so filtered slices keep display order
+    holdings_df = pd.DataFrame(data).astype(HOLDINGS_CATEGORY_DTYPES)
+    return holdings_df.sort_values("value", ascending=False).reset_index(drop=True)
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_vip_fund_count() -> int:
+    """Get the number of distinct VIP tickers in the current holdings.
 
+    Cached separately so the tabs showing it get a plain int back on rerun instead of
+    re-hashing the ticker column.
+    """
+    holdings_df = get_current_holdings_vip()
+    if holdings_df.empty:
+        return 0
+    return int(pd.unique(holdings_df["ticker"].to_numpy()).size)
 
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_aggregated_holdings():
     """Get aggregated holdings by ticker with cost basis and breakdown details.
 
@@ -588,7 +664,7 @@ def get_aggregated_holdings():
     - price_date: Date of the latest price
     - holdings: List of individual holdings (for breakdown view)
     """
-    db = TransactionDatabase("portfolio.db")
+    db = get_db()
     cursor = db.conn.cursor()
 
     # Load holdings from JSON file
@@ -687,8 +763,6 @@ def get_aggregated_holdings():
             "net_units": net_units,
         }
 
-    db.close()
-
     # Build aggregated holdings
     aggregated = []
     for ticker, ticker_data in holdings_by_ticker.items():
@@ -5,10 +5,14 @@
 # ============================================================================
 
 GET_ALL_FUNDS = """
-    SELECT DISTINCT fund_name, COALESCE(mapped_fund_name, fund_name) as display_name
+    SELECT
+        fund_name,
+        COALESCE(MAX(mapped_fund_name), fund_name) as display_name,
+        COUNT(*) as tx_count
     FROM transactions
     WHERE excluded = 0
-    ORDER BY COALESCE(mapped_fund_name, fund_name)
+    GROUP BY fund_name
+    ORDER BY display_name
 """
 
 GET_FUND_TRANSACTIONS = """
@@ -16,8 +20,7 @@ GET_FUND_TRANSACTIONS = """
         date,
         platform,
         tax_wrapper,
-        fund_name,
-        mapped_fund_name,
+        COALESCE(NULLIF(mapped_fund_name, ''), fund_name) as fund_name,
         transaction_type,
         units,
         price_per_unit,
@@ -70,6 +73,28 @@ GET_FUND_HOLDINGS = """
     ORDER BY units_held DESC
 """
 
+GET_CUMULATIVE_UNITS = """
+    SELECT
+        date,
+        SUM(SUM(CASE WHEN transaction_type = 'BUY' THEN units ELSE -units END))
+            OVER (ORDER BY date) as cumulative_units
+    FROM transactions
+    WHERE fund_name = ? AND excluded = 0
+    GROUP BY date
+    ORDER BY date
+"""
+
+GET_FUND_SUMMARY = """
+    SELECT
+        COUNT(*) as transaction_count,
+        COALESCE(SUM(transaction_type = 'BUY'), 0) as buy_count,
+        COALESCE(SUM(transaction_type = 'SELL'), 0) as sell_count,
+        COALESCE(SUM(CASE WHEN transaction_type = 'BUY' THEN value ELSE 0 END), 0) as total_buys,
+        COALESCE(SUM(CASE WHEN transaction_type = 'SELL' THEN value ELSE 0 END), 0) as total_sells
+    FROM transactions
+    WHERE fund_name = ? AND excluded = 0
+"""
+
 GET_STANDARDIZED_NAME = """
     SELECT COALESCE(mapped_fund_name, fund_name) as display_name
     FROM transactions
@@ -77,26 +102,82 @@ GET_STANDARDIZED_NAME = """
     LIMIT 1
 """
 
+# ============================================================================
+# Price History Queries
+# ============================================================================
+
+GET_TICKER_FUND_NAMES = """
+    SELECT ticker, fund_name
+    FROM price_history
+    GROUP BY ticker
+"""
+
+GET_PRICE_HISTORY = """
+    SELECT date AS Date, close_price AS Price, ticker, fund_name
+    FROM price_history
+    WHERE ticker = ?
+    ORDER BY date
+"""
+
+# Placeholders for the ticker list are filled in with str.format before executing
+GET_PRICE_HISTORY_FOR_TICKERS = """
+    SELECT date AS Date, close_price AS Price, ticker, fund_name
+    FROM price_history
+    WHERE ticker IN ({placeholders})
+    ORDER BY ticker, date
+"""
+
 # ============================================================================
 # Mapping Queries
 # ============================================================================
 
-GET_FUND_MAPPING_STATUS = """
-    SELECT fund_name, COUNT(*) as transaction_count,
-           MAX(COALESCE(mapped_fund_name, '')) as mapped_fund_name
-    FROM transactions
-    WHERE excluded = 0
-    GROUP BY fund_name
-    ORDER BY transaction_count DESC
+# Funds with transactions and their mapped ticker, shared by the status table and the
+# summary counts so the two always agree
+FUND_TICKERS_CTE = """
+    WITH fund_counts AS (
+        SELECT fund_name, COUNT(*) as transaction_count,
+               MAX(COALESCE(mapped_fund_name, '')) as mapped_fund_name
+        FROM transactions
+        WHERE excluded = 0
+        GROUP BY fund_name
+    ),
+    fund_tickers AS (
+        SELECT fc.*,
+               (SELECT ticker FROM fund_ticker_mapping m
+                WHERE m.fund_name = fc.fund_name LIMIT 1) as ticker
+        FROM fund_counts fc
+    )
 """
 
-GET_PRICE_HISTORY_COUNT = """
-    SELECT COUNT(*) as count FROM price_history WHERE ticker = ?
+GET_FUND_MAPPING_STATUS = (
+    FUND_TICKERS_CTE
+    + """
+    SELECT
+        ft.fund_name,
+        ft.mapped_fund_name,
+        ft.transaction_count,
+        ft.ticker,
+        EXISTS(SELECT 1 FROM price_history p WHERE p.ticker = ft.ticker) as has_price_history,
+        COALESCE(
+            (SELECT vip FROM fund_ticker_mapping m WHERE m.ticker = ft.ticker LIMIT 1), 0
+        ) as vip
+    FROM fund_tickers ft
+    ORDER BY vip DESC, transaction_count DESC
 """
+)
 
-GET_VIP_STATUS = """
-    SELECT vip FROM fund_ticker_mapping WHERE ticker = ? LIMIT 1
+GET_FUND_MAPPING_SUMMARY = (
+    FUND_TICKERS_CTE
+    + """
+    SELECT
+        COUNT(*) as total_funds,
+        COUNT(*) FILTER (WHERE ticker IS NOT NULL) as mapped_count,
+        COUNT(*) FILTER (
+            WHERE EXISTS(SELECT 1 FROM price_history p WHERE p.ticker = ft.ticker)
+        ) as with_price_history
+    FROM fund_tickers ft
 """
+)
 
 # ============================================================================
 # VIP Holdings Queries
@@ -116,18 +197,6 @@ GET_VIP_TICKER_INFO = """
     WHERE ftm.vip = 1
 """
 
-# ============================================================================
-# Funds List Queries
-# ============================================================================
-
-GET_FUNDS_WITH_COUNTS = """
-    SELECT COALESCE(mapped_fund_name, fund_name) as display_name, COUNT(*) as tx_count
-    FROM transactions
-    WHERE excluded = 0
-    GROUP BY COALESCE(mapped_fund_name, fund_name)
-    ORDER BY COALESCE(mapped_fund_name, fund_name)
-"""
-
 # ============================================================================
 # Portfolio Valuation Queries
 # ============================================================================
@@ -34,6 +34,12 @@ def main():
 
     st.title("📈 Portfolio Fund Viewer")
 
+    with st.sidebar:
+        if st.button("🔄 Refresh Data", help="Reload all data from the database"):
+            st.cache_data.clear()
+            # Drop the Price History tab's per-session copy of the selected ticker's data
+            st.session_state.pop("price_history_ticker", None)
+
     # Create tabs
     holdings_tab, transactions_tab, prices_tab, mapping_tab = st.tabs(
         [
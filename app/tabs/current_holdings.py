@@ -1,15 +1,18 @@
 """Current Holdings tab for portfolio viewer."""
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
 from app.data import (
     get_current_holdings_vip,
+    get_vip_fund_count,
     get_recent_transactions,
     get_aggregated_holdings,
-    get_price_history,
+    get_price_history_bulk,
 )
+from app.charts import downsample_price_history
 
 
 # Color mapping for tax wrappers
@@ -27,26 +30,116 @@ WRAPPER_EMOJI = {
     "GIA": "🟠",
 }
 
+# Number formats for the at-a-glance breakdown table
+BREAKDOWN_COLUMN_CONFIG = {
+    "Units": st.column_config.NumberColumn("Units", format="%,.2f"),
+    "Cost": st.column_config.NumberColumn("Cost", format="£%,.0f"),
+    "Value": st.column_config.NumberColumn("Value", format="£%,.0f"),
+    "% of Position": st.column_config.NumberColumn("% of Position", format="%.1f%%"),
+}
+
+# Emoji-prefixed tax wrapper labels for table display
+WRAPPER_LABELS = {"ISA": "🔵 ISA", "SIPP": "🟢 SIPP", "GIA": "🟠 GIA", "OTHER": "🔴 OTHER"}
+
+# Emoji-prefixed transaction type labels for table display
+TRANSACTION_TYPE_LABELS = {"BUY": "🟢 BUY", "SELL": "🔴 SELL"}
+
+
+def color_tax_wrapper_series(wrappers: pd.Series) -> pd.Series:
+    """Add emoji to a Series of tax wrapper names, leaving unknown wrappers unchanged."""
+    # Map plain values: filling a categorical with labels outside its categories fails
+    wrappers = wrappers.astype(object)
+    return wrappers.map(WRAPPER_LABELS).fillna(wrappers)
+
+
+def color_transaction_type_series(tx_types: pd.Series) -> pd.Series:
+    """Add emoji to a Series of transaction types, leaving unknown types unchanged."""
+    tx_types = tx_types.astype(object)
+    return tx_types.map(TRANSACTION_TYPE_LABELS).fillna(tx_types)
+
+
+def build_breakdown_df(holdings_breakdown: list[dict], position_value: float) -> pd.DataFrame:
+    """Build the per wrapper/platform breakdown table for one aggregated holding.
+
+    Columns are built from whole arrays; Units, Cost, Value and % of Position stay numeric
+    and are formatted by BREAKDOWN_COLUMN_CONFIG.
+    """
+    bd = pd.DataFrame(holdings_breakdown)
+    gain = bd["gain_loss"].to_numpy(dtype=np.float64)
+    gain_pct = bd["gain_loss_pct"].to_numpy(dtype=np.float64)
 
-def color_tax_wrapper(wrapper: str) -> str:
-    """Add emoji to tax wrapper name."""
-    colors = {"ISA": "🔵 ISA", "SIPP": "🟢 SIPP", "GIA": "🟠 GIA", "OTHER": "🔴 OTHER"}
-    return colors.get(wrapper, wrapper)
+    # Format gain/loss with sign before £
+    gain_loss_text = (
+        pd.Series(np.where(gain >= 0, "+£", "-£"))
+        + pd.Series(np.abs(gain)).map("{:,.0f}".format)
+        + pd.Series(np.where(gain_pct >= 0, " (+", " (-"))
+        + pd.Series(np.abs(gain_pct)).map("{:.1f}%)".format)
+    )
+
+    wrapper_label = bd["tax_wrapper"].map(WRAPPER_EMOJI).fillna("") + " " + bd["tax_wrapper"]
+
+    return pd.DataFrame(
+        {
+            "Tax Wrapper": wrapper_label,
+            "Platform": bd["platform"],
+            "Units": bd["units"],
+            "Cost": bd["cost"],
+            "Value": bd["value"],
+            "Gain/Loss": gain_loss_text,
+            "% of Position": bd["value"] / position_value * 100,
+        }
+    )
+
+
+def render_holding_details(holding: dict, price_df: pd.DataFrame | None):
+    """Render the breakdown table and price chart for one aggregated holding."""
+    holdings_breakdown = holding["holdings"]
+    gain_loss = holding["gain_loss"]
 
+    # Breakdown table
+    if holdings_breakdown:
+        st.markdown("**Breakdown by Tax Wrapper & Platform:**")
+        st.dataframe(
+            build_breakdown_df(holdings_breakdown, holding["total_value"]),
+            hide_index=True,
+            use_container_width=True,
+            column_config=BREAKDOWN_COLUMN_CONFIG,
+        )
 
-def color_transaction_type(tx_type: str) -> str:
-    """Add emoji to transaction type."""
-    if tx_type == "BUY":
-        return "🟢 BUY"
-    elif tx_type == "SELL":
-        return "🔴 SELL"
-    return tx_type
+    # Price history chart
+    st.markdown("**Price History:**")
+    if price_df is not None:
+        # Create a compact price chart from a downsampled line
+        line_df = downsample_price_history(price_df)
+        fig = go.Figure()
+        fig.add_trace(
+            go.Scattergl(
+                x=line_df["Date"],
+                y=line_df["Price"],
+                fill="tozeroy",
+                name="Price",
+                line=dict(color="#22c55e" if gain_loss >= 0 else "#ef4444", width=2),
+                hovertemplate="<b>%{x|%Y-%m-%d}</b><br>Price: £%{y:.2f}<extra></extra>",
+            )
+        )
+        fig.update_layout(
+            height=250,
+            margin=dict(l=0, r=0, t=10, b=0),
+            xaxis=dict(showgrid=False, showticklabels=True),
+            yaxis=dict(showgrid=True, gridcolor="#e5e5e5", tickprefix="£"),
+            template="plotly_white",
+            showlegend=False,
+            hovermode="x unified",
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No price history available for this ticker.")
 
 
 def render_at_a_glance_section():
     """Render the Portfolio At a Glance section with aggregated holdings."""
     st.subheader("📊 Portfolio At a Glance")
-    st.markdown("*Aggregated positions sorted by value • Click to expand breakdown*")
+    st.markdown("*Aggregated positions sorted by value • Load details for the breakdown*")
 
     aggregated = get_aggregated_holdings()
 
@@ -54,16 +147,16 @@ def render_at_a_glance_section():
         st.warning("No holdings data available.")
         return
 
-    # Calculate totals
-    total_value = sum(h["total_value"] for h in aggregated)
+    # Calculate totals (portfolio_value is reused for each holding's share below)
+    portfolio_value = sum(h["total_value"] for h in aggregated)
     total_cost = sum(h["cost_basis"] for h in aggregated)
-    total_gain = total_value - total_cost
+    total_gain = portfolio_value - total_cost
     total_gain_pct = (total_gain / total_cost * 100) if total_cost > 0 else 0
 
     # Summary metrics row
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("💰 Total Value", f"£{total_value:,.0f}")
+        st.metric("💰 Total Value", f"£{portfolio_value:,.0f}")
     with col2:
         st.metric("💵 Total Cost", f"£{total_cost:,.0f}")
     with col3:
@@ -73,6 +166,12 @@ def render_at_a_glance_section():
 
     st.divider()
 
+    # Load price history in one query for every holding whose details are already open
+    loaded_tickers = tuple(
+        h["ticker"] for h in aggregated if st.session_state.get(f"holding_details_{h['ticker']}")
+    )
+    price_histories = get_price_history_bulk(loaded_tickers) if loaded_tickers else {}
+
     # Render each holding as an expandable card
     for holding in aggregated:
         ticker = holding["ticker"]
@@ -83,13 +182,12 @@ def render_at_a_glance_section():
         cost_basis = holding["cost_basis"]
         gain_loss = holding["gain_loss"]
         gain_loss_pct = holding["gain_loss_pct"]
-        holdings_breakdown = holding["holdings"]
 
         # Determine gain/loss emoji
         gain_emoji = "📈" if gain_loss >= 0 else "📉"
 
         # Create expander label with key info
-        pct_of_portfolio = total_value / sum(h["total_value"] for h in aggregated) * 100
+        pct_of_portfolio = total_value / portfolio_value * 100 if portfolio_value else 0
         label = f"**{fund_name}** — £{total_value:,.0f} ({pct_of_portfolio:.1f}%)"
 
         with st.expander(label, expanded=False):
@@ -110,116 +208,29 @@ def render_at_a_glance_section():
                     delta=f"{gain_loss_pct:+.1f}%" if cost_basis > 0 else "N/A",
                 )
 
-            # Breakdown table
-            if holdings_breakdown:
-                st.markdown("**Breakdown by Tax Wrapper & Platform:**")
-                breakdown_data = []
-                for h in holdings_breakdown:
-                    wrapper_emoji = WRAPPER_EMOJI.get(h["tax_wrapper"], "")
-                    h_cost = h.get("cost", 0)
-                    h_gain = h.get("gain_loss", 0)
-                    h_gain_pct = h.get("gain_loss_pct", 0)
-                    # Format gain/loss with sign before £
-                    gain_sign = "+" if h_gain >= 0 else "-"
-                    pct_sign = "+" if h_gain_pct >= 0 else "-"
-                    breakdown_data.append(
-                        {
-                            "Tax Wrapper": f"{wrapper_emoji} {h['tax_wrapper']}",
-                            "Platform": h["platform"],
-                            "Units": f"{h['units']:,.2f}",
-                            "Cost": f"£{h_cost:,.0f}",
-                            "Value": f"£{h['value']:,.0f}",
-                            "Gain/Loss": f"{gain_sign}£{abs(h_gain):,.0f} ({pct_sign}{abs(h_gain_pct):.1f}%)",
-                            "% of Position": f"{(h['value'] / total_value * 100):.1f}%",
-                        }
-                    )
-
-                breakdown_df = pd.DataFrame(breakdown_data)
-                st.dataframe(
-                    breakdown_df,
-                    hide_index=True,
-                    use_container_width=True,
-                )
-
-            # Price history chart
-            st.markdown("**Price History:**")
-            price_df = get_price_history(ticker)
-            if not price_df.empty:
-                # Create a compact price chart
-                fig = go.Figure()
-                fig.add_trace(
-                    go.Scatter(
-                        x=price_df["Date"],
-                        y=price_df["Price"],
-                        fill="tozeroy",
-                        name="Price",
-                        line=dict(color="#22c55e" if gain_loss >= 0 else "#ef4444", width=2),
-                        hovertemplate="<b>%{x|%Y-%m-%d}</b><br>Price: £%{y:.2f}<extra></extra>",
-                    )
-                )
-                fig.update_layout(
-                    height=250,
-                    margin=dict(l=0, r=0, t=10, b=0),
-                    xaxis=dict(showgrid=False, showticklabels=True),
-                    yaxis=dict(showgrid=True, gridcolor="#e5e5e5", tickprefix="£"),
-                    template="plotly_white",
-                    showlegend=False,
-                    hovermode="x unified",
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No price history available for this ticker.")
-
-
-def render_current_holdings_tab():
-    """Render the Current Holdings tab."""
-    st.header("💼 Current Holdings")
-
-    # View selector
-    view_mode = st.radio(
-        "Select View",
-        ["📊 At a Glance", "📋 Detailed View"],
-        horizontal=True,
-        key="holdings_view_mode",
-    )
-
-    st.divider()
-
-    if view_mode == "📊 At a Glance":
-        render_at_a_glance_section()
-        return
-
-    # ---- Detailed View (existing code) ----
-    st.subheader("📋 Detailed Holdings by Wrapper & Platform")
-
-    # Get VIP holdings
-    holdings_df = get_current_holdings_vip()
-
-    if holdings_df.empty:
-        st.warning("No VIP holdings found. Mark funds as VIP in the fund_ticker_mapping table.")
-        return
-
-    # Calculate total portfolio value
-    total_value = holdings_df["value"].sum()
-
-    # Display total value at top
-    col1, col2, col3 = st.columns([2, 2, 2])
-    with col1:
-        st.metric("💰 Total Portfolio Value", f"£{total_value:,.2f}")
-    with col2:
-        vip_count = holdings_df["ticker"].nunique()
-        st.metric("📊 VIP Funds", vip_count)
-    with col3:
-        # Get latest price date, filtering out None values
-        if "price_date" in holdings_df.columns:
-            valid_dates = holdings_df["price_date"].dropna()
-            latest_price_date = valid_dates.max() if not valid_dates.empty else "N/A"
-        else:
-            latest_price_date = "N/A"
-        st.metric("📅 Last Updated", latest_price_date)
-
-    st.divider()
-
+            # Breakdown and price chart are only built once the user asks for them
+            details_key = f"holding_details_{ticker}"
+            if st.button("Load details", key=f"holding_details_btn_{ticker}") or (
+                st.session_state.get(details_key)
+            ):
+                st.session_state[details_key] = True
+                if ticker in price_histories:
+                    price_df = price_histories[ticker]
+                else:
+                    price_df = get_price_history_bulk((ticker,)).get(ticker)
+                render_holding_details(holding, price_df)
+
+
+@st.fragment
+def render_filtered_holdings(
+    holdings_df: pd.DataFrame, fund_totals: pd.Series, wrapper_totals: pd.Series
+):
+    """Render the wrapper/platform filters with the chart and table they drive.
+
+    Runs as a fragment so toggling a filter checkbox only reruns this section rather than
+    the whole app. fund_totals and wrapper_totals are the unfiltered value sums per fund
+    and per tax wrapper, computed once by the caller.
+    """
     # ---- Tax wrapper filter checkboxes (horizontal) ----
     st.write("**Filter by Tax Wrapper:**")
     col_filter1, col_filter2, col_filter3 = st.columns(3)
@@ -240,59 +251,56 @@ def render_current_holdings_tab():
         wrapper_filters.append("GIA")
 
     # Filter holdings based on selected tax wrappers
-    if wrapper_filters:
-        filtered_holdings_df = holdings_df[holdings_df["tax_wrapper"].isin(wrapper_filters)]
-    else:
-        filtered_holdings_df = pd.DataFrame()  # Empty if no filters selected
-
-    if filtered_holdings_df.empty:
+    wrapper_mask = holdings_df["tax_wrapper"].isin(wrapper_filters).to_numpy()
+    if not wrapper_mask.any():
         st.warning("No holdings to display. Select at least one tax wrapper.")
         return
 
-    # ---- Platform filter checkboxes (horizontal) ----
-    st.write("**Filter by Platform:**")
-    all_platforms = sorted(filtered_holdings_df["platform"].unique())
-    platform_cols = st.columns(len(all_platforms) if len(all_platforms) <= 6 else 6)
-    selected_platforms = []
-    for idx, platform in enumerate(all_platforms):
-        col_idx = idx % 6
-        with platform_cols[col_idx]:
-            if st.checkbox(platform, value=True, key=f"platform_{platform}"):
-                selected_platforms.append(platform)
-
-    # Apply platform filter
-    if selected_platforms:
-        filtered_holdings_df = filtered_holdings_df[
-            filtered_holdings_df["platform"].isin(selected_platforms)
-        ]
-    else:
-        filtered_holdings_df = pd.DataFrame()
+    # ---- Platform filter ----
+    # Options come from all holdings so a wrapper toggle never changes them and resets the
+    # user's selection; the categorical's categories are already unique and sorted
+    all_platforms = holdings_df["platform"].cat.categories.tolist()
+    selected_platforms = st.multiselect(
+        "**Filter by Platform:**",
+        options=all_platforms,
+        default=all_platforms,
+        key="platform_filter",
+    )
 
-    if filtered_holdings_df.empty:
+    # Apply platform filter, slicing the holdings only once both masks are known
+    holdings_mask = wrapper_mask & holdings_df["platform"].isin(selected_platforms).to_numpy()
+    if not holdings_mask.any():
         st.warning("No holdings to display with current filters.")
         return
 
+    filtered_holdings_df = holdings_df[holdings_mask]
+
     # ---- Holdings by Fund (Horizontal Stacked Bar Chart) ----
     st.subheader("📈 Holdings by Fund & Tax Wrapper")
 
     # Create stacked bar chart using filtered data
     fig = go.Figure()
 
-    # Get unique funds from FILTERED data, sorted by total value (ascending for chart display)
-    fund_totals = (
-        filtered_holdings_df.groupby("fund_name")["value"].sum().sort_values(ascending=True)
+    # Pivot FILTERED data into a fund x wrapper matrix, sorted by fund total value
+    # (ascending for chart display)
+    fund_wrapper_values = filtered_holdings_df.pivot_table(
+        index="fund_name",
+        columns="tax_wrapper",
+        values="value",
+        aggfunc="sum",
+        fill_value=0,
+        observed=True,
     )
-    funds = fund_totals.index.tolist()
+    fund_order = fund_wrapper_values.sum(axis=1).sort_values(ascending=True).index
+    fund_wrapper_values = fund_wrapper_values.loc[fund_order]
+    funds = fund_wrapper_values.index.to_numpy()
 
     # Add a trace for each selected tax wrapper
     for wrapper in wrapper_filters:
-        wrapper_data = filtered_holdings_df[filtered_holdings_df["tax_wrapper"] == wrapper]
-        if not wrapper_data.empty:
-            # Create a list of values for each fund (0 if fund doesn't have this wrapper)
-            values = []
-            for fund in funds:
-                fund_value = wrapper_data[wrapper_data["fund_name"] == fund]["value"].sum()
-                values.append(fund_value)
+        if wrapper in fund_wrapper_values.columns:
+            # Value for each fund (0 if fund doesn't have this wrapper); a pivot column is a
+            # strided view, so copy it into one contiguous float64 buffer for Plotly
+            values = np.ascontiguousarray(fund_wrapper_values[wrapper].to_numpy(dtype=np.float64))
 
             fig.add_trace(
                 go.Bar(
@@ -322,112 +330,158 @@ def render_current_holdings_tab():
     # ---- Detailed Holdings Table ----
     st.subheader("📋 Detailed Holdings")
 
-    # Use filtered_holdings_df which already has platform filter applied
-    table_filtered_df = filtered_holdings_df.copy()
+    # Rows arrive sorted by value (descending) from get_current_holdings_vip, and the
+    # wrapper/platform masks keep that order
 
-    if table_filtered_df.empty:
-        st.warning("No holdings to display with current filters.")
-    else:
-        # Sort by value (descending) for display
-        table_filtered_df = table_filtered_df.sort_values(by="value", ascending=False)
+    # Recalculate total for table filtered holdings in a single pass over the raw values
+    holding_values = filtered_holdings_df["value"].to_numpy(dtype=np.float64)
+    table_filtered_total = holding_values.sum()
 
-        # Recalculate total for table filtered holdings
-        table_filtered_total = table_filtered_df["value"].sum()
+    # Create display dataframe with calculated percentages
+    display_df = filtered_holdings_df.copy()
 
-        # Create display dataframe with calculated percentages
-        display_df = table_filtered_df.copy()
+    # Calculate % of Total Holdings (for each fund across all wrappers/platforms)
+    # (a holding whose fund has no total counts as 100% of it; mapping a categorical
+    # column returns categories, so cast the looked-up totals back to floats)
+    fund_value = display_df["fund_name"].map(fund_totals).astype(np.float64)
+    display_df["pct_of_fund"] = display_df["value"] / fund_value.fillna(display_df["value"]) * 100
 
-        # Calculate % of Total Holdings (for each fund across all wrappers/platforms)
-        fund_totals = holdings_df.groupby("fund_name")["value"].sum()
-        display_df["pct_of_fund"] = display_df.apply(
-            lambda row: (row["value"] / fund_totals.get(row["fund_name"], row["value"])) * 100,
-            axis=1,
-        )
-
-        # Calculate % of Wrapper (within the same tax wrapper)
-        wrapper_totals = holdings_df.groupby("tax_wrapper")["value"].sum()
-        display_df["pct_of_wrapper"] = display_df.apply(
-            lambda row: (row["value"] / wrapper_totals.get(row["tax_wrapper"], row["value"])) * 100,
-            axis=1,
-        )
+    # Calculate % of Wrapper (within the same tax wrapper)
+    wrapper_value = display_df["tax_wrapper"].map(wrapper_totals).astype(np.float64)
+    display_df["pct_of_wrapper"] = (
+        display_df["value"] / wrapper_value.fillna(display_df["value"]) * 100
+    )
 
-        # Color code tax wrappers
-        display_df["tax_wrapper_colored"] = display_df["tax_wrapper"].apply(color_tax_wrapper)
-
-        # Select and reorder columns for Option B display
-        display_df = display_df[
-            [
-                "tax_wrapper_colored",
-                "fund_name",
-                "platform",
-                "units",
-                "price",
-                "value",
-                "pct_of_fund",
-                "pct_of_wrapper",
-            ]
-        ]
-        display_df.columns = [
-            "Tax Wrapper",
-            "Fund Name",
-            "Platform",
-            "Units",
-            "Latest Price (£)",
-            "Current Value (£)",
-            "% of Fund",
-            "% of Wrapper",
+    # Color code tax wrappers
+    display_df["tax_wrapper_colored"] = color_tax_wrapper_series(display_df["tax_wrapper"])
+
+    # Select and reorder columns for Option B display
+    display_df = display_df[
+        [
+            "tax_wrapper_colored",
+            "fund_name",
+            "platform",
+            "units",
+            "price",
+            "value",
+            "pct_of_fund",
+            "pct_of_wrapper",
         ]
+    ]
+    display_df.columns = [
+        "Tax Wrapper",
+        "Fund Name",
+        "Platform",
+        "Units",
+        "Latest Price (£)",
+        "Current Value (£)",
+        "% of Fund",
+        "% of Wrapper",
+    ]
+
+    # Show filtered total
+    st.info(f"Showing {len(display_df)} holdings | Total Value: £{table_filtered_total:,.2f}")
+
+    # Display table with increased width
+    st.dataframe(
+        display_df,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Tax Wrapper": st.column_config.TextColumn("Tax Wrapper", width="small"),
+            "Fund Name": st.column_config.TextColumn(
+                "Fund Name", width="large", help="Fund name from database mapping"
+            ),
+            "Platform": st.column_config.TextColumn("Platform", width="small"),
+            "Units": st.column_config.NumberColumn("Units", format="%,.2f", width="small"),
+            "Latest Price (£)": st.column_config.NumberColumn(
+                "Latest Price (£)",
+                format="£%,.2f",
+                width="small",
+                help="Current price in GBP (USD/EUR converted)",
+            ),
+            "Current Value (£)": st.column_config.NumberColumn(
+                "Current Value (£)",
+                format="£%,.0f",
+                width="medium",
+                help="Current market value in GBP",
+            ),
+            "% of Fund": st.column_config.ProgressColumn(
+                "% of Fund",
+                format="%.1f%%",
+                min_value=0,
+                max_value=100,
+                width="small",
+                help="Percentage of total holdings for this fund across all wrappers",
+            ),
+            "% of Wrapper": st.column_config.ProgressColumn(
+                "% of Wrapper",
+                format="%.1f%%",
+                min_value=0,
+                max_value=100,
+                width="small",
+                help="Percentage of total holdings within this tax wrapper",
+            ),
+        },
+    )
 
-        # Format numeric columns with thousand separators
-        display_df["Units"] = display_df["Units"].apply(lambda x: f"{x:,.2f}")
-        display_df["Latest Price (£)"] = display_df["Latest Price (£)"].apply(
-            lambda x: f"£{x:,.2f}"
-        )
-        display_df["Current Value (£)"] = display_df["Current Value (£)"].apply(
-            lambda x: f"£{x:,.0f}"
-        )
 
-        # Show filtered total
-        st.info(f"Showing {len(display_df)} holdings | Total Value: £{table_filtered_total:,.2f}")
+@st.fragment
+def render_current_holdings_tab():
+    """Render the Current Holdings tab."""
+    st.header("💼 Current Holdings")
 
-        # Display table with increased width
-        st.dataframe(
-            display_df,
-            hide_index=True,
-            use_container_width=True,
-            column_config={
-                "Tax Wrapper": st.column_config.TextColumn("Tax Wrapper", width="small"),
-                "Fund Name": st.column_config.TextColumn(
-                    "Fund Name", width="large", help="Fund name from database mapping"
-                ),
-                "Platform": st.column_config.TextColumn("Platform", width="small"),
-                "Units": st.column_config.TextColumn("Units", width="small"),
-                "Latest Price (£)": st.column_config.TextColumn(
-                    "Latest Price (£)",
-                    width="small",
-                    help="Current price in GBP (USD/EUR converted)",
-                ),
-                "Current Value (£)": st.column_config.TextColumn(
-                    "Current Value (£)", width="medium", help="Current market value in GBP"
-                ),
-                "% of Fund": st.column_config.ProgressColumn(
-                    "% of Fund",
-                    format="%.1f%%",
-                    min_value=0,
-                    max_value=100,
-                    width="small",
-                    help="Percentage of total holdings for this fund across all wrappers",
-                ),
-                "% of Wrapper": st.column_config.ProgressColumn(
-                    "% of Wrapper",
-                    format="%.1f%%",
-                    min_value=0,
-                    max_value=100,
-                    width="small",
-                    help="Percentage of total holdings within this tax wrapper",
-                ),
-            },
-        )
+    # View selector
+    view_mode = st.radio(
+        "Select View",
+        ["📊 At a Glance", "📋 Detailed View"],
+        horizontal=True,
+        key="holdings_view_mode",
+    )
+
+    st.divider()
+
+    if view_mode == "📊 At a Glance":
+        render_at_a_glance_section()
+        return
+
+    # ---- Detailed View (existing code) ----
+    st.subheader("📋 Detailed Holdings by Wrapper & Platform")
+
+    # Get VIP holdings
+    holdings_df = get_current_holdings_vip()
+
+    if holdings_df.empty:
+        st.warning("No VIP holdings found. Mark funds as VIP in the fund_ticker_mapping table.")
+        return
+
+    # Calculate total portfolio value
+    total_value = holdings_df["value"].sum()
+
+    # Display total value at top
+    col1, col2, col3 = st.columns([2, 2, 2])
+    with col1:
+        st.metric("💰 Total Portfolio Value", f"£{total_value:,.2f}")
+    with col2:
+        st.metric("📊 VIP Funds", get_vip_fund_count())
+    with col3:
+        # Get latest price date, filtering out None values
+        if "price_date" in holdings_df.columns:
+            valid_dates = holdings_df["price_date"].dropna()
+            latest_price_date = valid_dates.max() if not valid_dates.empty else "N/A"
+        else:
+            latest_price_date = "N/A"
+        st.metric("📅 Last Updated", latest_price_date)
+
+    st.divider()
+
+    # Unfiltered totals for the % of Fund / % of Wrapper columns; computed here so filter
+    # toggles, which only rerun the fragment, don't regroup the holdings
+    render_filtered_holdings(
+        holdings_df,
+        fund_totals=holdings_df.groupby("fund_name", sort=False, observed=True)["value"].sum(),
+        wrapper_totals=holdings_df.groupby("tax_wrapper", sort=False, observed=True)["value"].sum(),
+    )
 
     # ---- Last 10 Transactions ----
     st.divider()
@@ -436,16 +490,12 @@ def render_current_holdings_tab():
     recent_tx_df = get_recent_transactions(limit=10)
 
     if not recent_tx_df.empty:
-        display_tx_df = recent_tx_df.copy()
-        display_tx_df["Type"] = display_tx_df["Type"].apply(color_transaction_type)
-        display_tx_df["Tax Wrapper"] = display_tx_df["Tax Wrapper"].apply(color_tax_wrapper)
-
-        # Format numeric columns with thousand separators
-        display_tx_df["Units"] = display_tx_df["Units"].apply(
-            lambda x: f"{float(x):,.2f}" if pd.notna(x) else ""
-        )
-        display_tx_df["Value (£)"] = display_tx_df["Value (£)"].apply(
-            lambda x: f"£{float(x):,.2f}" if pd.notna(x) else ""
+        # assign shares the untouched Date, Fund Name and number columns with the cached frame
+        display_tx_df = recent_tx_df.assign(
+            **{
+                "Type": color_transaction_type_series(recent_tx_df["Type"]),
+                "Tax Wrapper": color_tax_wrapper_series(recent_tx_df["Tax Wrapper"]),
+            }
         )
 
         st.dataframe(
@@ -456,8 +506,10 @@ def render_current_holdings_tab():
                 "Date": st.column_config.DateColumn("Date", format="YYYY-MM-DD", width="small"),
                 "Fund Name": st.column_config.TextColumn("Fund Name", width="large"),
                 "Type": st.column_config.TextColumn("Type", width="small"),
-                "Units": st.column_config.TextColumn("Units", width="small"),
-                "Value (£)": st.column_config.TextColumn("Value (£)", width="medium"),
+                "Units": st.column_config.NumberColumn("Units", format="%,.2f", width="small"),
+                "Value (£)": st.column_config.NumberColumn(
+                    "Value (£)", format="£%,.2f", width="medium"
+                ),
                 "Platform": st.column_config.TextColumn("Platform", width="small"),
                 "Tax Wrapper": st.column_config.TextColumn("Tax Wrapper", width="small"),
             },
@@ -1,10 +1,12 @@
 """Mapping Status tab for portfolio viewer."""
 
+import numpy as np
 import streamlit as st
 
-from app.data import get_fund_mapping_status
+from app.data import get_fund_mapping_status, get_fund_mapping_summary
 
 
+@st.fragment
 def render_mapping_status_tab():
     """Render the Mapping Status tab."""
     st.header("Mapping Status")
@@ -17,8 +19,7 @@ def render_mapping_status_tab():
         st.warning("No funds found in transactions database")
     else:
         # Create display dataframe with checkmarks and crosses
-        display_df = mapping_df.copy()
-        display_df.rename(
+        display_df = mapping_df.rename(
             columns={
                 "fund_name": "Fund Name",
                 "mapped_fund_name": "Mapped Name",
@@ -26,28 +27,27 @@ def render_mapping_status_tab():
                 "ticker": "Ticker",
                 "has_price_history": "Price History",
                 "vip": "VIP",
-            },
-            inplace=True,
+            }
         )
 
         # Format the Price History column with emoji checkmarks/crosses
-        display_df["Price History"] = display_df["Price History"].apply(
-            lambda x: "✅" if x else "❌"
+        display_df["Price History"] = np.where(
+            display_df["Price History"].to_numpy(dtype=bool), "✅", "❌"
         )
 
         # Format the VIP column with star emoji
-        display_df["VIP"] = display_df["VIP"].apply(lambda x: "⭐" if x else "")
+        display_df["VIP"] = np.where(display_df["VIP"].to_numpy(dtype=bool), "⭐", "")
+
+        # Display summary stats, counted in SQL
+        summary = get_fund_mapping_summary()
 
-        # Display summary stats
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Funds", len(mapping_df))
+            st.metric("Total Funds", summary["total_funds"])
         with col2:
-            mapped_count = (mapping_df["ticker"] != "—").sum()
-            st.metric("Mapped to Ticker", mapped_count)
+            st.metric("Mapped to Ticker", summary["mapped_count"])
         with col3:
-            with_history = mapping_df["has_price_history"].sum()
-            st.metric("With Price History", with_history)
+            st.metric("With Price History", summary["with_price_history"])
 
         st.divider()
 
@@ -67,9 +67,9 @@ def render_mapping_status_tab():
             },
         )
 
-        # Show unmapped funds if any
-        unmapped = mapping_df[mapping_df["ticker"] == "—"]
-        if not unmapped.empty:
+        # Show unmapped funds if any (the summary tells us without scanning the tickers)
+        if summary["mapped_count"] < summary["total_funds"]:
+            unmapped = mapping_df[mapping_df["ticker"].to_numpy() == "—"]
             st.divider()
             st.subheader(f"Funds Without Mappings ({len(unmapped)})")
             st.warning(f"{len(unmapped)} funds don't have ticker mappings yet")
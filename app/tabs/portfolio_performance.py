@@ -1,9 +1,15 @@
 """Portfolio Performance tab for portfolio viewer - Simply Wall St inspired design."""
 
+import pandas as pd
 import streamlit as st
 import numpy as np
 
-from app.data import get_portfolio_value_timeseries, get_current_holdings_vip
+from app.data import (
+    CACHE_TTL_SECONDS,
+    get_portfolio_value_timeseries,
+    get_current_holdings_vip,
+    get_vip_fund_count,
+)
 from app.charts import (
     create_portfolio_performance_chart,
     TIME_RANGES,
@@ -11,9 +17,19 @@ from app.charts import (
 )
 
 
-def calculate_annualized_irr(df, time_range: str) -> float:
-    """Calculate annualized IRR for the portfolio over the given time range."""
-    filtered_df = filter_dataframe_by_time_range(df, time_range)
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_performance_window(time_range: str) -> pd.DataFrame:
+    """Portfolio value and benchmark series sliced to a time range, memoized per range.
+
+    Switching back to a time range reuses the cached slice instead of re-filtering the
+    full history.
+    """
+    portfolio_df = get_portfolio_value_timeseries(include_benchmark=True, benchmark_ticker="VWRL.L")
+    return filter_dataframe_by_time_range(portfolio_df, time_range)
+
+
+def calculate_annualized_irr(filtered_df: pd.DataFrame) -> float:
+    """Calculate annualized IRR for the portfolio over an already time-filtered frame."""
     if filtered_df.empty or len(filtered_df) < 2:
         return 0.0
 
@@ -40,87 +56,21 @@ def calculate_annualized_irr(df, time_range: str) -> float:
     return annualized_return
 
 
-def render_portfolio_performance_tab():
-    """Render the Portfolio Performance tab with Simply Wall St inspired design."""
-
-    # Custom CSS for dark theme styling
-    st.markdown(
-        """
-    <style>
-    .performance-header {
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        margin-bottom: 1rem;
-    }
-    .metric-card {
-        background: #1a1a2e;
-        padding: 1rem;
-        border-radius: 8px;
-        text-align: center;
-    }
-    .metric-value {
-        font-size: 1.8rem;
-        font-weight: bold;
-        color: #ffffff;
-    }
-    .metric-label {
-        font-size: 0.85rem;
-        color: #9ca3af;
-    }
-    .metric-delta-positive {
-        color: #22c55e;
-        font-size: 0.9rem;
-    }
-    .metric-delta-negative {
-        color: #ef4444;
-        font-size: 0.9rem;
-    }
-    .time-range-btn {
-        background: #2d2d44;
-        border: none;
-        color: #9ca3af;
-        padding: 0.5rem 1rem;
-        border-radius: 6px;
-        cursor: pointer;
-    }
-    .time-range-btn-active {
-        background: #3b82f6;
-        color: white;
-    }
-    .bottom-metric {
-        background: #1a1a2e;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 3px solid #3b82f6;
-    }
-    </style>
-    """,
-        unsafe_allow_html=True,
-    )
-
-    # Initialize session state for time range
-    if "perf_time_range" not in st.session_state:
-        st.session_state.perf_time_range = "1Y"
-
-    # Fetch portfolio data with benchmark
-    portfolio_df = get_portfolio_value_timeseries(include_benchmark=True, benchmark_ticker="VWRL.L")
+def set_time_range(time_range: str):
+    """Button callback storing the selected time range before the fragment reruns."""
+    st.session_state.perf_time_range = time_range
 
-    if portfolio_df.empty:
-        st.warning("No portfolio data available. Ensure you have transactions and price history.")
-        return
 
-    # Get current holdings for additional metrics
-    holdings_df = get_current_holdings_vip()
-
-    # Calculate total portfolio value from current holdings
-    total_value = (
-        holdings_df["value"].sum() if not holdings_df.empty else portfolio_df["Value"].iloc[-1]
-    )
+@st.fragment
+def render_performance_window(total_value: float, has_holdings: bool):
+    """Render the metrics, chart and breakdown for the selected time range.
 
+    Runs as a fragment so a time-range click only reruns this section, not the tab's data
+    loading above it.
+    """
     # Filter data for selected time range
     selected_range = st.session_state.perf_time_range
-    filtered_df = filter_dataframe_by_time_range(portfolio_df, selected_range)
+    filtered_df = get_performance_window(selected_range)
 
     if filtered_df.empty:
         st.warning("No data for selected time range.")
@@ -141,7 +91,7 @@ def render_portfolio_performance_tab():
             benchmark_return_pct = (bench_end - bench_start) / bench_start * 100
 
     # Calculate annualized IRR
-    annualized_irr = calculate_annualized_irr(portfolio_df, selected_range)
+    annualized_irr = calculate_annualized_irr(filtered_df)
 
     # === HEADER SECTION: Performance vs Market ===
     st.markdown("### Performance vs Market")
@@ -151,7 +101,7 @@ def render_portfolio_performance_tab():
 
     with col1:
         st.metric(label="Total Value", value=f"£{total_value:,.0f}", delta=None)
-        st.caption(f"{holdings_df['ticker'].nunique() if not holdings_df.empty else '—'} holdings")
+        st.caption(f"{get_vip_fund_count() if has_holdings else '—'} holdings")
 
     with col2:
         delta_color = "normal" if total_return_abs >= 0 else "inverse"
@@ -197,13 +147,18 @@ def render_portfolio_performance_tab():
         for i, tr in enumerate(time_ranges):
             with cols[i]:
                 btn_type = "primary" if st.session_state.perf_time_range == tr else "secondary"
-                if st.button(tr, key=f"tr_{tr}", type=btn_type, use_container_width=True):
-                    st.session_state.perf_time_range = tr
-                    st.rerun()
-
-    # Create and display the chart
+                st.button(
+                    tr,
+                    key=f"tr_{tr}",
+                    type=btn_type,
+                    use_container_width=True,
+                    on_click=set_time_range,
+                    args=(tr,),
+                )
+
+    # Create and display the chart (filtered_df is already sliced to the selected range)
     fig, metrics = create_portfolio_performance_chart(
-        portfolio_df, time_range=selected_range, benchmark_name="VWRL.L"
+        filtered_df, time_range="ALL", benchmark_name="VWRL.L"
     )
 
     if fig:
@@ -217,72 +172,40 @@ def render_portfolio_performance_tab():
     # Calculate unrealized percentage (simplified - all current holdings are unrealized)
     unrealized_pct = total_return_pct if total_return_pct != 0 else 0
 
+    # Period high/low positions, found once and used for both the value and its date
+    period_values = filtered_df["Value"].to_numpy()
+    period_dates = filtered_df["Date"].to_numpy()
+    high_idx = period_values.argmax()
+    low_idx = period_values.argmin()
+
     # Bottom metrics row
     met_col1, met_col2, met_col3, met_col4 = st.columns(4)
 
-    with met_col1:
-        st.markdown(
-            """
-        <div style="background: #1e1e2f; padding: 1rem; border-radius: 8px; border-left: 3px solid #22c55e;">
-            <div style="color: #9ca3af; font-size: 0.85rem;">Unrealized Returns</div>
-            <div style="color: #ffffff; font-size: 1.5rem; font-weight: bold;">£{:,.0f}</div>
-            <div style="color: #22c55e; font-size: 0.9rem;">{:.1f}%</div>
-        </div>
-        """.format(
-                total_return_abs if total_return_abs > 0 else 0,
-                unrealized_pct if unrealized_pct > 0 else 0,
-            ),
-            unsafe_allow_html=True,
+    with met_col1, st.container(border=True):
+        st.metric(
+            label="Unrealized Returns",
+            value=f"£{max(total_return_abs, 0):,.0f}",
+            delta=f"{max(unrealized_pct, 0):.1f}%",
         )
 
-    with met_col2:
-        st.markdown(
-            """
-        <div style="background: #1e1e2f; padding: 1rem; border-radius: 8px; border-left: 3px solid #3b82f6;">
-            <div style="color: #9ca3af; font-size: 0.85rem;">Period High</div>
-            <div style="color: #ffffff; font-size: 1.5rem; font-weight: bold;">£{:,.0f}</div>
-            <div style="color: #9ca3af; font-size: 0.9rem;">{}</div>
-        </div>
-        """.format(
-                filtered_df["Value"].max(),
-                filtered_df.loc[filtered_df["Value"].idxmax(), "Date"].strftime("%b %d, %Y"),
-            ),
-            unsafe_allow_html=True,
-        )
+    with met_col2, st.container(border=True):
+        st.metric(label="Period High", value=f"£{period_values[high_idx]:,.0f}")
+        st.caption(pd.Timestamp(period_dates[high_idx]).strftime("%b %d, %Y"))
 
-    with met_col3:
-        st.markdown(
-            """
-        <div style="background: #1e1e2f; padding: 1rem; border-radius: 8px; border-left: 3px solid #f59e0b;">
-            <div style="color: #9ca3af; font-size: 0.85rem;">Period Low</div>
-            <div style="color: #ffffff; font-size: 1.5rem; font-weight: bold;">£{:,.0f}</div>
-            <div style="color: #9ca3af; font-size: 0.9rem;">{}</div>
-        </div>
-        """.format(
-                filtered_df["Value"].min(),
-                filtered_df.loc[filtered_df["Value"].idxmin(), "Date"].strftime("%b %d, %Y"),
-            ),
-            unsafe_allow_html=True,
-        )
+    with met_col3, st.container(border=True):
+        st.metric(label="Period Low", value=f"£{period_values[low_idx]:,.0f}")
+        st.caption(pd.Timestamp(period_dates[low_idx]).strftime("%b %d, %Y"))
 
-    with met_col4:
+    with met_col4, st.container(border=True):
         # Calculate volatility
         if len(filtered_df) > 1:
-            daily_returns = filtered_df["Value"].pct_change().dropna()
-            volatility = daily_returns.std() * np.sqrt(252) * 100  # Annualized
+            daily_returns = np.diff(period_values) / period_values[:-1]
+            volatility = float(daily_returns.std(ddof=1)) * np.sqrt(252) * 100  # Annualized
         else:
             volatility = 0
 
-        st.markdown(
-            """
-        <div style="background: #1e1e2f; padding: 1rem; border-radius: 8px; border-left: 3px solid #8b5cf6;">
-            <div style="color: #9ca3af; font-size: 0.85rem;">Volatility (Ann.)</div>
-            <div style="color: #ffffff; font-size: 1.5rem; font-weight: bold;">{:.1f}%</div>
-            <div style="color: #9ca3af; font-size: 0.9rem;">{} data points</div>
-        </div>
-        """.format(volatility, len(filtered_df)),
-            unsafe_allow_html=True,
-        )
+        st.metric(label="Volatility (Ann.)", value=f"{volatility:.1f}%")
+        st.caption(f"{len(filtered_df)} data points")
 
     # Outperformance indicator
     if benchmark_return_pct != 0:
@@ -300,3 +223,67 @@ def render_portfolio_performance_tab():
         """,
             unsafe_allow_html=True,
         )
+
+
+def render_portfolio_performance_tab():
+    """Render the Portfolio Performance tab with Simply Wall St inspired design."""
+
+    # Custom CSS for dark theme styling
+    st.markdown(
+        """
+    <style>
+    .performance-header {
+        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
+        padding: 1.5rem;
+        border-radius: 12px;
+        margin-bottom: 1rem;
+    }
+    .metric-label {
+        font-size: 0.85rem;
+        color: #9ca3af;
+    }
+    .metric-delta-positive {
+        color: #22c55e;
+        font-size: 0.9rem;
+    }
+    .metric-delta-negative {
+        color: #ef4444;
+        font-size: 0.9rem;
+    }
+    .time-range-btn {
+        background: #2d2d44;
+        border: none;
+        color: #9ca3af;
+        padding: 0.5rem 1rem;
+        border-radius: 6px;
+        cursor: pointer;
+    }
+    .time-range-btn-active {
+        background: #3b82f6;
+        color: white;
+    }
+    </style>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    # Initialize session state for time range
+    if "perf_time_range" not in st.session_state:
+        st.session_state.perf_time_range = "1Y"
+
+    # Fetch portfolio data with benchmark
+    portfolio_df = get_portfolio_value_timeseries(include_benchmark=True, benchmark_ticker="VWRL.L")
+
+    if portfolio_df.empty:
+        st.warning("No portfolio data available. Ensure you have transactions and price history.")
+        return
+
+    # Get current holdings for additional metrics
+    holdings_df = get_current_holdings_vip()
+
+    # Calculate total portfolio value from current holdings
+    total_value = (
+        holdings_df["value"].sum() if not holdings_df.empty else portfolio_df["Value"].iloc[-1]
+    )
+
+    render_performance_window(total_value, has_holdings=not holdings_df.empty)
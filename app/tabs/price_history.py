@@ -1,45 +1,89 @@
 """Price History tab for portfolio viewer."""
 
+import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 
 from app.data import (
+    CACHE_TTL_SECONDS,
     get_all_price_tickers,
     get_ticker_info_dict,
     get_price_history,
     get_transactions_for_ticker,
 )
-from app.charts import create_price_chart
-
-
-# Currency symbol mapping for tickers
-TICKER_CURRENCY_MAP = {
-    "BRK-B": "$",
-    "EMIM.L": "p",
-    "GB00B2PLJD73": "£",
-    "GB00BD6PG787": "£",
-    "GB00BF0TZG22": "p",
-    "LU1033663649": "£",
-    "MWOT.DE": "€",
-    "NVDA": "$",
-    "VERG.L": "£",
-    "VUAG.L": "£",
-    "VWRP.L": "£",
+from app.charts import create_price_chart, TICKER_CURRENCY_MAP
+
+
+# Price formatters by currency symbol, used for the single-value metrics
+PRICE_FORMATTERS = {
+    "$": "${:.2f}".format,
+    "p": "{:.2f}p".format,
+    "€": "€{:.2f}".format,
+    "£": "£{:.2f}".format,
+}
+
+# Client-side price formats for the price tables, by currency symbol
+PRICE_COLUMN_FORMATS = {
+    "$": "$%.2f",
+    "p": "%.2fp",
+    "€": "€%.2f",
+    "£": "£%.2f",
 }
 
+# Client-side format for the yearly Change % column
+PCT_CHANGE_FORMAT = "%+.2f%%"
+
+# Rows shown in the price history data table unless the full history is requested
+PRICE_TABLE_ROWS = 1000
+
 
 def get_price_format(currency_symbol: str):
-    """Get a price formatting function for the given currency symbol."""
-    if currency_symbol == "$":
-        return lambda x: f"${x:.2f}"
-    elif currency_symbol == "p":
-        return lambda x: f"{x:.2f}p"
-    elif currency_symbol == "€":
-        return lambda x: f"€{x:.2f}"
-    else:  # £
-        return lambda x: f"£{x:.2f}"
+    """Get a price formatting function for the given currency symbol (defaults to £)."""
+    return PRICE_FORMATTERS.get(currency_symbol, PRICE_FORMATTERS["£"])
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_price_chart(ticker: str, fund_name: str) -> go.Figure:
+    """Build the price chart for a ticker, with buy/sell markers, memoized per ticker.
+
+    Loads the price history and transactions itself so the cache key stays small. The
+    markers are always added; the transactions toggle only changes their visibility.
+    """
+    price_df = get_price_history(ticker)
+    transactions_df = get_transactions_for_ticker(ticker)
+    return create_price_chart(price_df, ticker, fund_name, transactions_df)
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_ticker_display_names() -> dict[str, str]:
+    """Map each price ticker to its selector label ("<ticker> - <fund name>")."""
+    ticker_info_dict = get_ticker_info_dict()
+    return {
+        ticker: f"{ticker} - {ticker_info_dict.get(ticker, 'Unknown')}"
+        for ticker in get_all_price_tickers()
+    }
+
 
+def load_selected_ticker_data(ticker: str) -> tuple[pd.DataFrame, pd.Series]:
+    """Get price history and BUY/SELL transaction counts for the selected ticker.
 
+    Both are kept in st.session_state until a different ticker is selected, so widget
+    events that leave the ticker unchanged (toggle, button) skip the reload. Only the
+    counts are kept for transactions; the chart builder loads the full rows itself.
+    """
+    if st.session_state.get("price_history_ticker") != ticker:
+        st.session_state["price_history_df"] = get_price_history(ticker)
+        st.session_state["price_history_type_counts"] = (
+            get_transactions_for_ticker(ticker)
+            .get("Type", pd.Series(dtype="category"))
+            .value_counts()
+        )
+        st.session_state["price_history_ticker"] = ticker
+    return st.session_state["price_history_df"], st.session_state["price_history_type_counts"]
+
+
+@st.fragment
 def render_price_history_tab():
     """Render the Price History tab."""
     st.header("Price History")
@@ -53,31 +97,32 @@ def render_price_history_tab():
         return
 
     # Create a mapping for display
-    ticker_to_display = {
-        ticker: f"{ticker} - {ticker_info_dict.get(ticker, 'Unknown')}" for ticker in tickers
-    }
+    ticker_to_display = get_ticker_display_names()
 
     # Fund/Instrument selector
     selected_ticker = st.selectbox(
         "Select a Fund or Instrument to Analyze",
         options=tickers,
-        format_func=lambda t: ticker_to_display[t],
+        format_func=ticker_to_display.__getitem__,
         key="ticker_selector",
     )
 
     if selected_ticker:
         # Get price history data
-        price_df = get_price_history(selected_ticker)
-        transactions_df = get_transactions_for_ticker(selected_ticker)
+        price_df, type_counts = load_selected_ticker_data(selected_ticker)
         fund_name = ticker_info_dict.get(selected_ticker, selected_ticker)
 
         # Determine currency symbol and format
         currency_symbol = TICKER_CURRENCY_MAP.get(selected_ticker, "£")
         price_format = get_price_format(currency_symbol)
+        price_column_format = PRICE_COLUMN_FORMATS.get(currency_symbol, PRICE_COLUMN_FORMATS["£"])
 
         if price_df.empty:
             st.warning(f"No price history found for {selected_ticker}")
         else:
+            prices = price_df["Price"].to_numpy(dtype=np.float64)
+            first_price, latest_price = prices[0], prices[-1]
+
             # Header with ticker info
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -85,7 +130,6 @@ def render_price_history_tab():
             with col2:
                 st.subheader(f"Fund: {fund_name}")
             with col3:
-                latest_price = price_df["Price"].iloc[-1] if not price_df.empty else 0
                 st.metric("Latest Price", price_format(latest_price))
 
             # Summary statistics - Min Price and Total Change
@@ -93,44 +137,50 @@ def render_price_history_tab():
             col1, col2 = st.columns(2)
 
             with col1:
-                min_price = price_df["Price"].min()
-                st.metric("Min Price", price_format(min_price))
+                st.metric("Min Price", price_format(prices.min()))
 
             with col2:
-                price_change = price_df["Price"].iloc[-1] - price_df["Price"].iloc[0]
-                pct_change = (
-                    (price_change / price_df["Price"].iloc[0]) * 100
-                    if price_df["Price"].iloc[0] != 0
-                    else 0
-                )
+                price_change = latest_price - first_price
+                pct_change = (price_change / first_price) * 100 if first_price != 0 else 0
                 st.metric("Total Change", f"{price_format(price_change)} ({pct_change:+.1f}%)")
 
             # Yearly performance analysis
             st.subheader("Yearly Performance")
-            price_df_yearly = price_df.copy()
-            price_df_yearly["Year"] = pd.to_datetime(price_df_yearly["Date"]).dt.year
-
-            yearly_data = []
-            for year in sorted(price_df_yearly["Year"].unique()):
-                year_prices = price_df_yearly[price_df_yearly["Year"] == year]
-                if not year_prices.empty:
-                    open_price = year_prices.iloc[0]["Price"]
-                    close_price = year_prices.iloc[-1]["Price"]
-                    year_change = close_price - open_price
-                    year_pct_change = (year_change / open_price * 100) if open_price != 0 else 0
-
-                    yearly_data.append(
-                        {
-                            "Year": int(year),
-                            "Open Price": price_format(open_price),
-                            "Close Price": price_format(close_price),
-                            "Change %": f"{year_pct_change:+.2f}%",
-                        }
-                    )
-
-            if yearly_data:
-                yearly_df = pd.DataFrame(yearly_data)
-                st.dataframe(yearly_df, width="stretch", hide_index=True)
+            years = price_df["Date"].dt.to_period("Y").rename("Year")
+            yearly_prices = price_df.groupby(years, sort=True)["Price"].agg(
+                open="first", close="last"
+            )
+            year_pct_change = (
+                (yearly_prices["close"] - yearly_prices["open"]) / yearly_prices["open"] * 100
+            ).where(yearly_prices["open"] != 0, 0.0)
+
+            if not yearly_prices.empty:
+                # Numbers stay numeric and are formatted by the dataframe widget
+                yearly_df = pd.DataFrame(
+                    {
+                        "Year": yearly_prices.index.year.to_numpy(dtype=np.int64),
+                        "Open Price": yearly_prices["open"].to_numpy(),
+                        "Close Price": yearly_prices["close"].to_numpy(),
+                        "Change %": year_pct_change.to_numpy(),
+                    }
+                )
+                st.dataframe(
+                    yearly_df,
+                    width="stretch",
+                    hide_index=True,
+                    column_config={
+                        "Year": st.column_config.NumberColumn("Year", format="%d"),
+                        "Open Price": st.column_config.NumberColumn(
+                            "Open Price", format=price_column_format
+                        ),
+                        "Close Price": st.column_config.NumberColumn(
+                            "Close Price", format=price_column_format
+                        ),
+                        "Change %": st.column_config.NumberColumn(
+                            "Change %", format=PCT_CHANGE_FORMAT
+                        ),
+                    },
+                )
             else:
                 st.info("No yearly data available")
 
@@ -142,31 +192,59 @@ def render_price_history_tab():
                 "Show buy/sell transactions", value=True, key="show_transactions_toggle"
             )
 
-            # Pass transactions if toggle is on
-            transactions_to_show = transactions_df if show_transactions else None
-            fig = create_price_chart(price_df, selected_ticker, fund_name, transactions_to_show)
+            fig = get_price_chart(selected_ticker, fund_name)
             if fig:
+                if not show_transactions:
+                    # Hide the markers but keep them in the legend so they can be clicked back
+                    fig.update_traces(visible="legendonly", selector=dict(mode="markers"))
                 st.plotly_chart(fig, width="stretch")
 
             # Show transaction summary if data exists
-            if not transactions_df.empty:
-                buy_count = len(transactions_df[transactions_df["Type"] == "BUY"])
-                sell_count = len(transactions_df[transactions_df["Type"] == "SELL"])
+            transaction_count = int(type_counts.sum())
+            if transaction_count:
+                buy_count = int(type_counts.get("BUY", 0))
+                sell_count = int(type_counts.get("SELL", 0))
                 st.info(
-                    f"Found {len(transactions_df)} buy/sell transactions for this ticker "
+                    f"Found {transaction_count} buy/sell transactions for this ticker "
                     f"({buy_count} buys, {sell_count} sells)"
                 )
             else:
                 st.info("No buy/sell transactions found for this ticker")
 
-            # Price data table - behind a button
-            if st.button("Show Price History Data", key="show_price_history_btn"):
+            # Price data table - behind a button, most recent rows only unless asked for all
+            btn_col, full_col = st.columns([1, 3])
+            with full_col:
+                show_full_history = st.checkbox(
+                    "Show full history", value=False, key="show_full_price_history"
+                )
+            # Remember the button press so ticking "Show full history" keeps the table shown
+            price_table_key = f"show_price_history_{selected_ticker}"
+            with btn_col:
+                if st.button("Show Price History Data", key="show_price_history_btn"):
+                    st.session_state[price_table_key] = True
+
+            if st.session_state.get(price_table_key):
                 st.subheader("Price History Data")
-                df_display = price_df.copy()
-                df_display["Date"] = pd.to_datetime(df_display["Date"]).dt.date
-                df_display["Price"] = df_display["Price"].apply(price_format)
-                df_display = df_display[["Date", "Price"]].rename(
-                    columns={"Date": "Date", "Price": "Close Price"}
+                table_df = price_df if show_full_history else price_df.tail(PRICE_TABLE_ROWS)
+                if len(table_df) < len(price_df):
+                    st.caption(
+                        f"Showing the most recent {len(table_df):,} of {len(price_df):,} "
+                        "prices. Tick 'Show full history' to see them all."
+                    )
+                df_display = pd.DataFrame(
+                    {
+                        "Date": table_df["Date"].dt.date,
+                        "Close Price": table_df["Price"],
+                    }
                 )
 
-                st.dataframe(df_display, width="stretch", hide_index=True)
+                st.dataframe(
+                    df_display,
+                    width="stretch",
+                    hide_index=True,
+                    column_config={
+                        "Close Price": st.column_config.NumberColumn(
+                            "Close Price", format=price_column_format
+                        )
+                    },
+                )
@@ -1,31 +1,64 @@
 """Transaction History tab for portfolio viewer."""
 
-import pandas as pd
+import io
+
 import streamlit as st
 
-from app.data import get_all_funds_from_db, get_fund_transactions, get_standardized_name
+from app.data import (
+    CACHE_TTL_SECONDS,
+    get_all_funds_from_db,
+    get_cumulative_units,
+    get_fund_summary,
+    get_fund_transactions,
+    get_standardized_name,
+)
 from app.charts import create_timeline_chart, create_cumulative_units_chart
 
+# Rows written per batch when serialising the CSV export
+CSV_EXPORT_CHUNK_ROWS = 10_000
+
+# Client-side number formats for the All Transactions table
+TRANSACTION_COLUMN_CONFIG = {
+    "Units": st.column_config.NumberColumn("Units", format="%,.2f"),
+    "Price (£)": st.column_config.NumberColumn("Price (£)", format="£%,.2f"),
+    "Value (£)": st.column_config.NumberColumn("Value (£)", format="£%,.2f"),
+}
+
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_fund_csv(fund_name: str) -> bytes:
+    """Serialise a fund's transactions to CSV bytes, memoized per fund.
+
+    Reruns that keep the same fund selected reuse the bytes instead of re-encoding the
+    whole frame for the download button.
+    """
+    csv_buffer = io.BytesIO()
+    get_fund_transactions(fund_name).to_csv(
+        csv_buffer, index=False, chunksize=CSV_EXPORT_CHUNK_ROWS
+    )
+    return csv_buffer.getvalue()
+
+
+@st.fragment
 def render_transaction_history_tab():
     """Render the Transaction History tab."""
     st.header("Transaction History")
 
     # Fund selector at the top
-    funds_dict = get_all_funds_from_db()
+    funds_df = get_all_funds_from_db()
 
-    if not funds_dict:
+    if funds_df.empty:
         st.error("No funds available")
         return
 
     # Create a selectbox with display names but return original fund names
-    fund_keys = list(funds_dict.keys())
-    fund_display_names = [funds_dict[k] for k in fund_keys]
+    fund_keys = funds_df["fund_name"].tolist()
+    fund_display_names = funds_df["display_name"].tolist()
 
     selected_index = st.selectbox(
         "Select a Fund to Analyze",
         options=range(len(fund_keys)),
-        format_func=lambda i: fund_display_names[i],
+        format_func=fund_display_names.__getitem__,
         key="fund_selector",
     )
     selected_fund = fund_keys[selected_index]
@@ -34,10 +67,10 @@ def render_transaction_history_tab():
         # Get standardized name
         standardized_name = get_standardized_name(selected_fund)
 
-        # Get transactions for this fund
-        df = get_fund_transactions(selected_fund)
+        # Summary counts and totals come straight from SQL
+        summary = get_fund_summary(selected_fund)
 
-        if df.empty:
+        if summary["transaction_count"] == 0:
             st.warning(f"No transactions found for {selected_fund}")
         else:
             # Header with fund info
@@ -52,25 +85,21 @@ def render_transaction_history_tab():
             col1, col2, col3, col4 = st.columns(4)
 
             with col1:
-                total_transactions = len(df)
-                st.metric("Total Transactions", total_transactions)
+                st.metric("Total Transactions", summary["transaction_count"])
 
             with col2:
-                buy_count = len(df[df["Type"] == "BUY"])
-                st.metric("Buy Orders", buy_count)
+                st.metric("Buy Orders", summary["buy_count"])
 
             with col3:
-                sell_count = len(df[df["Type"] == "SELL"])
-                st.metric("Sell Orders", sell_count)
+                st.metric("Sell Orders", summary["sell_count"])
 
             with col4:
-                buys_df = df[df["Type"] == "BUY"]
-                sells_df = df[df["Type"] == "SELL"]
-                total_buys = buys_df["Value (£)"].sum() if not buys_df.empty else 0
-                total_sells = sells_df["Value (£)"].sum() if not sells_df.empty else 0
-                net = total_buys - total_sells
+                net = summary["total_buys"] - summary["total_sells"]
                 st.metric("Net (Buys - Sells) (£)", f"£{net:,.2f}")
 
+            # Full transactions are only needed for the charts and table below
+            df = get_fund_transactions(selected_fund)
+
             # Charts
             st.subheader("Charts")
 
@@ -82,28 +111,30 @@ def render_transaction_history_tab():
                     st.plotly_chart(timeline_fig, width="stretch")
 
             with chart_col2:
-                cumulative_fig = create_cumulative_units_chart(df, selected_fund)
+                cumulative_fig = create_cumulative_units_chart(
+                    get_cumulative_units(selected_fund), selected_fund
+                )
                 if cumulative_fig:
                     st.plotly_chart(cumulative_fig, width="stretch")
 
             # Transactions table
             st.subheader("All Transactions")
 
-            # Format for display
-            df_display = df.copy()
-            df_display["Date"] = pd.to_datetime(df_display["Date"]).dt.date
-            df_display["Units"] = df_display["Units"].apply(lambda x: f"{x:,.2f}")
-            df_display["Price (£)"] = df_display["Price (£)"].apply(lambda x: f"£{x:,.2f}")
-            df_display["Value (£)"] = df_display["Value (£)"].apply(lambda x: f"£{x:,.2f}")
+            # Numbers stay numeric and are formatted by the dataframe widget
+            df_display = df.assign(Date=df["Date"].dt.date)
 
-            st.dataframe(df_display, width="stretch", hide_index=True)
+            st.dataframe(
+                df_display,
+                width="stretch",
+                hide_index=True,
+                column_config=TRANSACTION_COLUMN_CONFIG,
+            )
 
             # Export option
             st.subheader("Export")
-            csv = df.to_csv(index=False)
             st.download_button(
                 label="Download Transactions as CSV",
-                data=csv,
+                data=get_fund_csv(selected_fund),
                 file_name=f"{selected_fund}_transactions.csv",
                 mime="text/csv",
             )
@@ -17,19 +17,38 @@ logger = logging.getLogger(__name__)
 class TransactionDatabase:
     """SQLite database for portfolio transactions."""
 
-    def __init__(self, db_path: str | Path = "portfolio.db"):
+    def __init__(self, db_path: str | Path = "portfolio.db", check_same_thread: bool = True):
         """
         Initialize the database connection.
 
         Args:
             db_path: Path to the SQLite database file.
+            check_same_thread: If False, allow the connection to be used from threads
+                other than the one that created it (e.g. a shared Streamlit connection).
         """
         self.db_path = Path(db_path)
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread)
         self.conn.row_factory = sqlite3.Row  # Enable column access by name
+        self.configure_connection()
         self.create_tables()
         logger.info(f"Connected to database: {self.db_path}")
 
+    def configure_connection(self) -> None:
+        """
+        Tune the connection for the app's read-heavy workload.
+
+        WAL lets readers see a stable snapshot without blocking writers, and the
+        memory-mapped IO and larger page cache let repeated SELECTs be served from
+        memory instead of a read() per page. In-memory databases ignore the WAL and
+        mmap settings.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MB (negative = KiB)
+        cursor.execute("PRAGMA temp_store=MEMORY")
+
     def create_tables(self) -> None:
         """
         Create the database tables if they don't exist.
@@ -94,17 +113,28 @@ class TransactionDatabase:
         )
         cursor.execute(
             """
-            CREATE INDEX IF NOT EXISTS idx_fund_name ON transactions(fund_name)
+            CREATE INDEX IF NOT EXISTS idx_platform ON transactions(platform)
         """
         )
         cursor.execute(
             """
-            CREATE INDEX IF NOT EXISTS idx_platform ON transactions(platform)
+            CREATE INDEX IF NOT EXISTS idx_tax_wrapper ON transactions(tax_wrapper)
         """
         )
+        # Composite indexes for the app's per-fund and date-ordered reads, which
+        # always filter out excluded transactions. idx_tx_fund_date also returns a
+        # fund's rows in date order, so ORDER BY date needs no temp sort, and its
+        # fund_name prefix serves plain fund_name lookups too.
         cursor.execute(
             """
-            CREATE INDEX IF NOT EXISTS idx_tax_wrapper ON transactions(tax_wrapper)
+            CREATE INDEX IF NOT EXISTS idx_tx_fund_date
+            ON transactions(fund_name, excluded, date)
+        """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_tx_excluded_date
+            ON transactions(excluded, date)
         """
         )
         cursor.execute(
@@ -6,6 +6,7 @@ from unittest.mock import Mock
 
 import pandas as pd
 import pytest
+import streamlit as st
 
 from portfolio.core.database import TransactionDatabase
 from portfolio.core.models import Transaction, TransactionType
@@ -306,6 +307,22 @@ def sample_holdings_dataframe():
     )
 
 
+# ============================================================================
+# STREAMLIT FIXTURES
+# ============================================================================
+
+
+@pytest.fixture(autouse=True)
+def clear_streamlit_cache():
+    """Clear Streamlit caches between tests so cached queries and the shared
+    connection never leak mocked results."""
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
 # ============================================================================
 # PYTEST CONFIGURATION
 # ============================================================================
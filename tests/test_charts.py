@@ -0,0 +1,87 @@
+"""Unit tests for app/charts/charts.py helpers."""
+
+import numpy as np
+import pandas as pd
+
+from app.charts import (
+    create_cumulative_units_chart,
+    create_timeline_chart,
+    downsample_price_history,
+    lttb_downsample,
+)
+
+
+def make_transactions_df() -> pd.DataFrame:
+    """Build a date-sorted buy/sell frame shaped like get_fund_transactions output."""
+    return pd.DataFrame(
+        {
+            "Date": pd.to_datetime(["2024-01-01", "2024-02-01"]),
+            "Type": ["BUY", "SELL"],
+            "Units": [3.0, 1.0],
+        }
+    )
+
+
+class TestLttbDownsample:
+    """Test lttb_downsample function."""
+
+    def test_lttb_downsample_returns_all_indices_for_short_series(self):
+        """Test series no longer than n_out are returned untouched."""
+        x = np.arange(10)
+        indices = lttb_downsample(x, x * 2.0, n_out=10)
+
+        assert indices.tolist() == list(range(10))
+
+    def test_lttb_downsample_keeps_endpoints_and_peak(self):
+        """Test the first, last and extreme points survive downsampling."""
+        x = np.arange(1000)
+        y = np.zeros(1000)
+        y[500] = 100.0
+
+        indices = lttb_downsample(x, y, n_out=50)
+
+        assert len(indices) == 50
+        assert indices[0] == 0
+        assert indices[-1] == 999
+        assert 500 in indices
+        assert np.all(np.diff(indices) > 0)
+
+
+class TestDownsamplePriceHistory:
+    """Test downsample_price_history function."""
+
+    def test_downsample_price_history_caps_rows(self):
+        """Test long histories are cut to max_points and short ones returned as-is."""
+        df = pd.DataFrame(
+            {"Date": pd.date_range("2020-01-01", periods=500), "Price": np.arange(500.0)}
+        )
+
+        assert len(downsample_price_history(df, max_points=100)) == 100
+        assert downsample_price_history(df, max_points=500) is df
+
+
+class TestTransactionCharts:
+    """Test create_timeline_chart and create_cumulative_units_chart."""
+
+    def test_create_timeline_chart_signs_bars(self):
+        """Test bars keep the input date order and are negative for sells."""
+        df = make_transactions_df()
+
+        fig = create_timeline_chart(df, "Test Fund")
+
+        assert fig.data[0].y.tolist() == [3.0, -1.0]
+        assert list(fig.data[0].marker.color) == ["green", "red"]
+        assert fig.data[0].customdata.tolist() == ["BUY", "SELL"]
+
+    def test_create_cumulative_units_chart_plots_running_totals(self):
+        """Test the chart plots the running totals it is given."""
+        df = pd.DataFrame(
+            {
+                "Date": pd.to_datetime(["2024-01-01", "2024-02-01"]),
+                "Cumulative Units": [3.0, 2.0],
+            }
+        )
+
+        fig = create_cumulative_units_chart(df, "Test Fund")
+
+        assert fig.data[0].y.tolist() == [3.0, 2.0]
@@ -0,0 +1,91 @@
+"""Unit tests for app/tabs/current_holdings.py rendering helpers."""
+
+import json
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from app.data.queries import HOLDINGS_CATEGORY_DTYPES
+from app.tabs.current_holdings import color_tax_wrapper_series
+from tests.fixtures.test_data import (
+    TEST_FUND_NAME_1,
+    TEST_FUND_NAME_2,
+    TEST_PLATFORM_FIDELITY,
+    TEST_PLATFORM_II,
+    TEST_TICKER_1,
+    TEST_TICKER_2,
+    TEST_WRAPPER_ISA,
+    TEST_WRAPPER_SIPP,
+)
+
+
+def make_holdings_df() -> pd.DataFrame:
+    """Build a categorical VIP holdings frame shaped like get_current_holdings_vip output."""
+    return pd.DataFrame(
+        {
+            "fund_name": [TEST_FUND_NAME_1, TEST_FUND_NAME_2, TEST_FUND_NAME_1],
+            "tax_wrapper": [
+                w.name for w in (TEST_WRAPPER_ISA, TEST_WRAPPER_SIPP, TEST_WRAPPER_SIPP)
+            ],
+            "platform": [
+                p.name for p in (TEST_PLATFORM_FIDELITY, TEST_PLATFORM_II, TEST_PLATFORM_II)
+            ],
+            "ticker": [TEST_TICKER_1, TEST_TICKER_2, TEST_TICKER_1],
+            "units": [10.0, 5.0, 2.0],
+            "price": [3.0, 4.0, 3.0],
+            "value": [30.0, 20.0, 6.0],
+        }
+    ).astype(HOLDINGS_CATEGORY_DTYPES)
+
+
+def render_filtered_holdings_script(holdings_df):
+    """AppTest script rendering the filtered holdings fragment for a holdings frame."""
+    from app.tabs.current_holdings import render_filtered_holdings
+
+    render_filtered_holdings(
+        holdings_df,
+        fund_totals=holdings_df.groupby("fund_name", observed=True)["value"].sum(),
+        wrapper_totals=holdings_df.groupby("tax_wrapper", observed=True)["value"].sum(),
+    )
+
+
+class TestColorTaxWrapperSeries:
+    """Test color_tax_wrapper_series function."""
+
+    def test_color_tax_wrapper_series_labels_categorical_wrappers(self):
+        """Test categorical wrappers are labelled and unknown wrappers kept as is."""
+        wrappers = pd.Series(["ISA", "JISA", "SIPP"], dtype="category")
+
+        labels = color_tax_wrapper_series(wrappers)
+
+        assert labels.tolist() == ["🔵 ISA", "JISA", "🟢 SIPP"]
+
+
+class TestRenderFilteredHoldings:
+    """Test render_filtered_holdings fragment."""
+
+    def test_render_filtered_holdings_with_categorical_holdings(self):
+        """Test the chart and table render from a categorical holdings frame."""
+        at = AppTest.from_function(
+            render_filtered_holdings_script, args=(make_holdings_df(),), default_timeout=30
+        )
+        at.run()
+
+        assert not at.exception
+        table = at.dataframe[0].value
+        assert table["Tax Wrapper"].tolist() == ["🔵 ISA", "🟢 SIPP", "🟢 SIPP"]
+        assert table["Current Value (£)"].tolist() == [30.0, 20.0, 6.0]
+
+    def test_render_filtered_holdings_chart_excludes_filtered_out_funds(self):
+        """Test funds and wrappers removed by the filters get no bars in the chart."""
+        at = AppTest.from_function(
+            render_filtered_holdings_script, args=(make_holdings_df(),), default_timeout=30
+        )
+        at.run()
+        at.checkbox(key="show_sipp").uncheck().run()
+
+        assert not at.exception
+        spec = json.loads(at.get("plotly_chart")[0].proto.spec)
+        assert [(trace["name"], trace["y"]) for trace in spec["data"]] == [
+            (TEST_WRAPPER_ISA.name, [TEST_FUND_NAME_1])
+        ]
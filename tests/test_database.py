@@ -1,6 +1,7 @@
 """Unit tests for portfolio/core/database.py database operations."""
 
 
+from portfolio.core.database import TransactionDatabase
 from portfolio.core.models import Transaction, TransactionType
 from tests.fixtures.test_data import (
     TEST_DATE_1,
@@ -375,3 +376,46 @@ class TestDatabaseUtilityMethods:
         # Verify the mapped name was updated
         transactions = populated_db.get_transactions_by_fund(TEST_FUND_NAME_1)
         assert transactions[0]["mapped_fund_name"] == new_name
+
+
+class TestDatabaseIndexes:
+    """Test indexes created alongside the tables."""
+
+    def test_create_tables_adds_composite_transaction_indexes(self, in_memory_db):
+        """Test the composite indexes used by the app's per-fund queries exist."""
+        cursor = in_memory_db.conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        index_names = {row["name"] for row in cursor.fetchall()}
+
+        assert {"idx_tx_fund_date", "idx_tx_excluded_date"} <= index_names
+        assert "idx_fund_name" not in index_names
+
+    def test_fund_transactions_query_uses_index_order(self, in_memory_db):
+        """Test the per-fund query seeks the composite index and skips the date sort."""
+        cursor = in_memory_db.conn.cursor()
+        cursor.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT date, units, value FROM transactions
+            WHERE fund_name = ? AND excluded = 0
+            ORDER BY date
+        """,
+            (TEST_FUND_NAME_1,),
+        )
+        plan = " ".join(row["detail"] for row in cursor.fetchall())
+
+        assert "USING INDEX idx_tx_fund_date" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestDatabaseConnectionSettings:
+    """Test pragmas applied when the connection is opened."""
+
+    def test_file_database_uses_wal_and_mmap(self, tmp_path):
+        """Test a file-backed database is opened in WAL mode with memory-mapped IO."""
+        with TransactionDatabase(tmp_path / "portfolio.db") as db:
+            cursor = db.conn.cursor()
+            assert cursor.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert cursor.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert cursor.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+            assert cursor.execute("PRAGMA cache_size").fetchone()[0] == -65536
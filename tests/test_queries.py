@@ -1,20 +1,40 @@
 """Unit tests for app/data/queries.py query functions."""
 
+from datetime import date
 
 import pandas as pd
 
 from app.data import queries
+from portfolio.core.models import Transaction, TransactionType
 from tests.fixtures.test_data import (
     TEST_FUND_NAME_1,
     TEST_FUND_NAME_2,
+    TEST_PLATFORM_FIDELITY,
+    TEST_TICKER_1,
+    TEST_TICKER_2,
+    TEST_WRAPPER_ISA,
 )
 
 
+class TestGetDb:
+    """Test get_db function."""
+
+    def test_get_db_reuses_single_connection(self, mocker):
+        """Test the database connection is opened once and shared between calls."""
+        mock_db_class = mocker.patch("app.data.queries.TransactionDatabase")
+
+        first = queries.get_db()
+        second = queries.get_db()
+
+        assert first is second
+        mock_db_class.assert_called_once_with("portfolio.db", check_same_thread=False)
+
+
 class TestGetAllFundsFromDb:
     """Test get_all_funds_from_db function."""
 
-    def test_get_all_funds_returns_dict(self, mocker):
-        """Test that function returns a dictionary."""
+    def test_get_all_funds_returns_dataframe(self, mocker):
+        """Test that function returns a DataFrame of funds with display names and counts."""
         # Mock the database connection and cursor
         mock_db = mocker.MagicMock()
         mock_cursor = mocker.MagicMock()
@@ -22,21 +42,22 @@ class TestGetAllFundsFromDb:
 
         # Mock cursor.fetchall() to return test data
         mock_cursor.fetchall.return_value = [
-            {"fund_name": TEST_FUND_NAME_1, "display_name": TEST_FUND_NAME_1},
-            {"fund_name": TEST_FUND_NAME_2, "display_name": TEST_FUND_NAME_2},
+            {"fund_name": TEST_FUND_NAME_1, "display_name": TEST_FUND_NAME_1, "tx_count": 3},
+            {"fund_name": TEST_FUND_NAME_2, "display_name": TEST_FUND_NAME_2, "tx_count": 1},
         ]
 
         mocker.patch("app.data.queries.TransactionDatabase", return_value=mock_db)
 
         funds = queries.get_all_funds_from_db()
 
-        assert isinstance(funds, dict)
+        assert isinstance(funds, pd.DataFrame)
+        assert list(funds.columns) == ["fund_name", "display_name", "tx_count"]
         assert len(funds) == 2
-        assert TEST_FUND_NAME_1 in funds
-        assert TEST_FUND_NAME_2 in funds
+        assert TEST_FUND_NAME_1 in funds["fund_name"].values
+        assert TEST_FUND_NAME_2 in funds["fund_name"].values
 
-    def test_get_all_funds_returns_empty_dict_when_no_funds(self, mocker):
-        """Test function returns empty dict when no funds found."""
+    def test_get_all_funds_returns_empty_dataframe_when_no_funds(self, mocker):
+        """Test function returns empty DataFrame when no funds found."""
         mock_db = mocker.MagicMock()
         mock_cursor = mocker.MagicMock()
         mock_db.conn.cursor.return_value = mock_cursor
@@ -46,8 +67,17 @@ class TestGetAllFundsFromDb:
 
         funds = queries.get_all_funds_from_db()
 
-        assert isinstance(funds, dict)
-        assert len(funds) == 0
+        assert isinstance(funds, pd.DataFrame)
+        assert funds.empty
+
+    def test_get_all_funds_counts_transactions_per_fund(self, mocker, populated_db):
+        """Test transaction counts are aggregated per original fund name."""
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
+
+        funds = queries.get_all_funds_from_db()
+
+        assert set(funds["fund_name"]) == {TEST_FUND_NAME_1, TEST_FUND_NAME_2}
+        assert funds["tx_count"].tolist() == [1, 1]
 
 
 class TestGetFundTransactions:
@@ -82,6 +112,8 @@ class TestGetFundTransactions:
         assert isinstance(df, pd.DataFrame)
         assert len(df) == 1
         assert df.iloc[0]["Fund Name"] == TEST_FUND_NAME_1
+        assert pd.api.types.is_datetime64_any_dtype(df["Date"])
+        assert isinstance(df["Type"].dtype, pd.CategoricalDtype)
 
     def test_get_fund_transactions_returns_empty_dataframe_when_no_match(self, mocker):
         """Test function returns empty DataFrame when fund not found."""
@@ -97,33 +129,83 @@ class TestGetFundTransactions:
         assert isinstance(df, pd.DataFrame)
         assert len(df) == 0
 
-    def test_get_fund_transactions_uses_mapped_name_when_available(self, mocker):
-        """Test that mapped fund name is used in display."""
-        mock_db = mocker.MagicMock()
-        mock_cursor = mocker.MagicMock()
-        mock_db.conn.cursor.return_value = mock_cursor
-
+    def test_get_fund_transactions_falls_back_to_fund_name_when_partly_mapped(
+        self, mocker, populated_db
+    ):
+        """Test rows without a mapped name keep the original fund name instead of null."""
         mapped_name = "Mapped Fund Name"
-        mock_cursor.fetchall.return_value = [
-            {
-                "date": "2024-01-15",
-                "platform": "Fidelity",
-                "tax_wrapper": "ISA",
-                "fund_name": TEST_FUND_NAME_1,
-                "mapped_fund_name": mapped_name,
-                "transaction_type": "BUY",
-                "units": 100.0,
-                "price_per_unit": 10.5,
-                "value": 1050.0,
-                "currency": "GBP",
-            }
-        ]
-
-        mocker.patch("app.data.queries.TransactionDatabase", return_value=mock_db)
+        populated_db.set_mapped_fund_name(TEST_FUND_NAME_1, mapped_name)
+        populated_db.insert_transaction(
+            Transaction(
+                date=date(2024, 3, 1),
+                fund_name=TEST_FUND_NAME_1,
+                transaction_type=TransactionType.BUY,
+                units=1.0,
+                price_per_unit=1.0,
+                value=1.0,
+                platform=TEST_PLATFORM_FIDELITY,
+                tax_wrapper=TEST_WRAPPER_ISA,
+            )
+        )
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
 
         df = queries.get_fund_transactions(TEST_FUND_NAME_1)
 
-        assert df.iloc[0]["Fund Name"] == mapped_name
+        assert df["Fund Name"].notna().all()
+        assert df["Fund Name"].tolist() == [mapped_name, TEST_FUND_NAME_1]
+
+
+class TestGetFundSummary:
+    """Test get_fund_summary function."""
+
+    def test_get_fund_summary_aggregates_counts_and_totals(self, mocker, populated_db):
+        """Test buy/sell counts and totals are aggregated for the fund."""
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
+
+        summary = queries.get_fund_summary(TEST_FUND_NAME_2)
+
+        assert summary["transaction_count"] == 1
+        assert summary["buy_count"] == 0
+        assert summary["sell_count"] == 1
+        assert summary["total_buys"] == 0
+        assert summary["total_sells"] > 0
+
+    def test_get_fund_summary_returns_zeros_for_unknown_fund(self, mocker, populated_db):
+        """Test an unknown fund gives zero counts rather than NULLs."""
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
+
+        summary = queries.get_fund_summary("NonexistentFund")
+
+        assert summary["transaction_count"] == 0
+        assert summary["total_buys"] == 0
+
+
+class TestGetCumulativeUnits:
+    """Test get_cumulative_units function."""
+
+    def test_get_cumulative_units_sums_per_date(self, mocker, in_memory_db):
+        """Test units are netted per date and accumulated in date order."""
+        buy, sell = TransactionType.BUY, TransactionType.SELL
+        for day, tx_type, units in [(1, buy, 10.0), (1, buy, 5.0), (2, sell, 4.0)]:
+            in_memory_db.insert_transaction(
+                Transaction(
+                    date=date(2024, 1, day),
+                    fund_name=TEST_FUND_NAME_1,
+                    transaction_type=tx_type,
+                    units=units,
+                    price_per_unit=1.0,
+                    value=units,
+                    platform=TEST_PLATFORM_FIDELITY,
+                    tax_wrapper=TEST_WRAPPER_ISA,
+                )
+            )
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=in_memory_db)
+
+        df = queries.get_cumulative_units(TEST_FUND_NAME_1)
+
+        assert list(df.columns) == ["Date", "Cumulative Units"]
+        assert pd.api.types.is_datetime64_any_dtype(df["Date"])
+        assert df["Cumulative Units"].tolist() == [15.0, 11.0]
 
 
 class TestGetAllTransactions:
@@ -226,3 +308,170 @@ class TestGetRecentTransactions:
         # Verify that limit parameter was used in the query
         queries.get_recent_transactions(limit=5)
         mock_cursor.execute.assert_called()
+
+
+class TestGetFundHoldings:
+    """Test get_fund_holdings function."""
+
+    def test_get_fund_holdings_renames_columns(self, mocker, populated_db):
+        """Test holdings are returned with display column names for funds still held."""
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
+
+        df = queries.get_fund_holdings()
+
+        assert list(df.columns) == ["Fund Name", "Units Held", "Transactions"]
+        assert df["Fund Name"].tolist() == [TEST_FUND_NAME_1]
+
+
+class TestGetTickerInfoDict:
+    """Test get_ticker_info_dict function."""
+
+    def test_get_ticker_info_dict_maps_tickers_to_fund_names(self, mocker, populated_db):
+        """Test each ticker with price history maps to its fund name."""
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
+
+        ticker_info = queries.get_ticker_info_dict()
+
+        assert ticker_info == {TEST_TICKER_1: TEST_FUND_NAME_1, TEST_TICKER_2: TEST_FUND_NAME_2}
+
+
+class TestGetPriceHistory:
+    """Test get_price_history function."""
+
+    def test_get_price_history_parses_dates(self, mocker, populated_db):
+        """Test dates are returned as datetime64 alongside the renamed price column."""
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
+
+        df = queries.get_price_history(TEST_TICKER_1)
+
+        assert list(df.columns) == ["Date", "Price", "ticker", "fund_name"]
+        assert pd.api.types.is_datetime64_any_dtype(df["Date"])
+        assert len(df) == 1
+
+    def test_get_price_history_returns_empty_dataframe_for_unknown_ticker(
+        self, mocker, populated_db
+    ):
+        """Test function returns an empty DataFrame when the ticker has no prices."""
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
+
+        df = queries.get_price_history("UNKNOWN")
+
+        assert isinstance(df, pd.DataFrame)
+        assert df.empty
+
+
+class TestGetPriceHistoryBulk:
+    """Test get_price_history_bulk function."""
+
+    def test_get_price_history_bulk_groups_by_ticker(self, mocker, populated_db):
+        """Test one query returns a per-ticker frame shaped like get_price_history."""
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
+
+        histories = queries.get_price_history_bulk((TEST_TICKER_1, TEST_TICKER_2, "UNKNOWN"))
+
+        assert set(histories) == {TEST_TICKER_1, TEST_TICKER_2}
+        assert list(histories[TEST_TICKER_1].columns) == ["Date", "Price", "ticker", "fund_name"]
+        assert pd.api.types.is_datetime64_any_dtype(histories[TEST_TICKER_1]["Date"])
+
+    def test_get_price_history_bulk_returns_empty_dict_without_tickers(self):
+        """Test no query is needed when there are no tickers."""
+        assert queries.get_price_history_bulk(()) == {}
+
+
+class TestGetTransactionsForTicker:
+    """Test get_transactions_for_ticker function."""
+
+    def test_get_transactions_for_ticker_uses_categorical_type(self, mocker, populated_db):
+        """Test transaction type is returned as a categorical column."""
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
+
+        df = queries.get_transactions_for_ticker(TEST_TICKER_1)
+
+        assert len(df) == 1
+        assert isinstance(df["Type"].dtype, pd.CategoricalDtype)
+        assert (df["Type"] == "BUY").all()
+
+
+class TestGetFundMappingStatus:
+    """Test get_fund_mapping_status function."""
+
+    def test_get_fund_mapping_status_sorts_vip_first(self, mocker, populated_db):
+        """Test ticker, price history and VIP status are resolved in a single query."""
+        populated_db.conn.execute(
+            "ALTER TABLE fund_ticker_mapping ADD COLUMN vip INTEGER DEFAULT 0"
+        )
+        populated_db.conn.execute(
+            "UPDATE fund_ticker_mapping SET vip = 1 WHERE ticker = ?", (TEST_TICKER_2,)
+        )
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
+
+        df = queries.get_fund_mapping_status()
+
+        assert df["fund_name"].tolist() == [TEST_FUND_NAME_2, TEST_FUND_NAME_1]
+        assert df["ticker"].tolist() == [TEST_TICKER_2, TEST_TICKER_1]
+        assert df["vip"].tolist() == [True, False]
+        assert df["has_price_history"].all()
+        assert (df["mapped_fund_name"] == "—").all()
+
+    def test_get_fund_mapping_status_returns_empty_dataframe_when_no_funds(self, mocker):
+        """Test function returns an empty DataFrame with the expected columns."""
+        mock_db = mocker.MagicMock()
+        mock_cursor = mocker.MagicMock()
+        mock_db.conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = []
+
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=mock_db)
+
+        df = queries.get_fund_mapping_status()
+
+        assert df.empty
+        assert "vip" in df.columns
+
+
+class TestGetFundMappingSummary:
+    """Test get_fund_mapping_summary function."""
+
+    def test_get_fund_mapping_summary_counts_mapped_funds(self, mocker, populated_db):
+        """Test unmapped funds count towards the total but not the mapped counts."""
+        populated_db.insert_transaction(
+            Transaction(
+                date=date(2024, 1, 1),
+                fund_name="Unmapped Fund",
+                transaction_type=TransactionType.BUY,
+                units=1.0,
+                price_per_unit=1.0,
+                value=1.0,
+                platform=TEST_PLATFORM_FIDELITY,
+                tax_wrapper=TEST_WRAPPER_ISA,
+            )
+        )
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=populated_db)
+
+        summary = queries.get_fund_mapping_summary()
+
+        assert summary == {"total_funds": 3, "mapped_count": 2, "with_price_history": 2}
+
+    def test_get_fund_mapping_summary_returns_zeros_without_funds(self, mocker, in_memory_db):
+        """Test an empty database gives zero counts."""
+        mocker.patch("app.data.queries.TransactionDatabase", return_value=in_memory_db)
+
+        summary = queries.get_fund_mapping_summary()
+
+        assert summary == {"total_funds": 0, "mapped_count": 0, "with_price_history": 0}
+
+
+class TestGetVipFundCount:
+    """Test get_vip_fund_count function."""
+
+    def test_get_vip_fund_count_counts_distinct_tickers(self, mocker):
+        """Test tickers held in several wrappers are only counted once."""
+        holdings_df = pd.DataFrame({"ticker": [TEST_TICKER_1, TEST_TICKER_1, TEST_TICKER_2]})
+        mocker.patch("app.data.queries.get_current_holdings_vip", return_value=holdings_df)
+
+        assert queries.get_vip_fund_count() == 2
+
+    def test_get_vip_fund_count_returns_zero_without_holdings(self, mocker):
+        """Test an empty holdings frame gives a count of zero."""
+        mocker.patch("app.data.queries.get_current_holdings_vip", return_value=pd.DataFrame())
+
+        assert queries.get_vip_fund_count() == 0